@@ -20,6 +20,18 @@ from ..core.store import DB
 
 logger = get_logger(__name__)
 
+_BIND_MENU_TEXT = "\n".join(
+    (
+        "1) Add Google (Gmail/Calendar/Contacts)",
+        "2) Add Microsoft (Mail/Calendar/Contacts)",
+        "3) Add IMAP/SMTP",
+        "4) Add CalDAV",
+        "5) Add CardDAV",
+        "6) Modify existing account (alias/capabilities)",
+        "0) Exit",
+    )
+)
+
 
 def _bootstrap_total_from_out(out: Dict[str, Any]) -> int:
     bootstrap = out.get("bootstrap")
@@ -75,13 +87,7 @@ def bind_menu() -> Dict[str, Any]:
     typer.echo("MailHub account binding")
     _print_accounts(db)
     typer.echo("")
-    typer.echo("1) Add Google (Gmail/Calendar/Contacts)")
-    typer.echo("2) Add Microsoft (Mail/Calendar/Contacts)")
-    typer.echo("3) Add IMAP/SMTP")
-    typer.echo("4) Add CalDAV")
-    typer.echo("5) Add CardDAV")
-    typer.echo("6) Modify existing account (alias/capabilities)")
-    typer.echo("0) Exit")
+    typer.echo(_BIND_MENU_TEXT)
     choice = typer.prompt("Select action", default="1").strip()
 
     if choice in ("1", "2", "3", "4", "5"):
@@ -351,8 +357,12 @@ def _bind_modify_choice(db: DB) -> Dict[str, Any]:
     accounts = list_accounts(db, hide_email_when_alias=False)
     if not accounts:
         return {"ok": False, "message": "No accounts to modify"}
-    for idx, a in enumerate(accounts, start=1):
-        typer.echo(f"{idx}) {a['display_name']} [{a['id']}] {a['capabilities']}")
+    typer.echo(
+        "\n".join(
+            "%d) %s [%s] %s" % (idx, a["display_name"], a["id"], a["capabilities"])
+            for idx, a in enumerate(accounts, start=1)
+        )
+    )
     raw = typer.prompt("Select account index", default="1")
     try:
         i = int(raw)
@@ -380,10 +390,11 @@ def _print_accounts(db: DB) -> None:
     if not accounts:
         typer.echo("Configured accounts: (none)")
         return
-    typer.echo("Configured accounts:")
+    lines = ["Configured accounts:"]
     for a in accounts:
-        email_part = f" <{a['email']}>" if a.get("email") else ""
-        typer.echo(f"- {a['display_name']}{email_part} [{a['id']}] caps={a['capabilities']}")
+        email_part = " <%s>" % a["email"] if a.get("email") else ""
+        lines.append("- %s%s [%s] caps=%s" % (a["display_name"], email_part, a["id"], a["capabilities"]))
+    typer.echo("\n".join(lines))
 
 
 def _ensure_google_client(s: Settings) -> None:
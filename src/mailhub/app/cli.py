@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+import functools
+import importlib
 import json
 import sys
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from .bind import bind_list, bind_menu, bind_provider, bind_update_account
-from .wizard import run_wizard
+from .command_specs import group_help, is_command, is_group
+from .console import emit as _emit, get_console as _console
 from ..core.config import Settings
 from ..core.dbkey_backend import (
     BACKEND_KEYCHAIN,
@@ -26,43 +26,64 @@ from ..core.dbkey_backend import (
     read_dbkey,
     write_dbkey,
 )
-from ..core.jobs import (
-    cache_latest_result,
-    config_checklist,
-    doctor_report,
-    ensure_config_confirmed,
-    get_cached_result,
-    mark_config_reviewed,
-    run_jobs,
-    should_offer_bind_interactive,
-)
 from ..core.logging import configure_logging, get_logger, log_event
-from ..flows.billing import billing_analyze, billing_detect, billing_month
-from ..flows.calendar import agenda, calendar_event
-from ..flows.ingest import inbox_ingest_day, inbox_poll, inbox_read
-from ..flows.analysis import analysis_list, analysis_record
-from ..flows.reply import (
-    reply_auto,
-    reply_center,
-    reply_compose,
-    reply_prepare,
-    reply_revise,
-    reply_send,
-    reply_sent_list,
-    reply_suggested_list,
-    send_queue_list,
-    send_queue_send_all,
-    send_queue_send_one,
-)
-from ..flows.summary import daily_summary
-from ..flows.triage import triage_day, triage_suggest
-from ..connectors.providers.caldav import auth_caldav
-from ..connectors.providers.carddav import auth_carddav
-from ..connectors.providers.google_gmail import auth_google
-from ..connectors.providers.imap_smtp import auth_imap
-from ..connectors.providers.ms_graph import auth_microsoft
-from ..core.store import DB
-from ..shared.time import utc_now_iso
+from ..shared import jsoncodec
+
+
+def _lz(module: str, name: str) -> Callable[..., Any]:
+    """
+    Lazy loader: import `module` (relative to this package) on first call.
+    Keeps `mailhub --help`/`doctor` from paying for flow/provider modules they never run.
+    """
+    target: Callable[..., Any] | None = None
+
+    def _call(*args: Any, **kwargs: Any) -> Any:
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module, __package__), name)
+        return target(*args, **kwargs)
+
+    _call.__name__ = name
+    return _call
+
+
+bind_list = _lz(".bind", "bind_list")
+bind_menu = _lz(".bind", "bind_menu")
+bind_provider = _lz(".bind", "bind_provider")
+bind_update_account = _lz(".bind", "bind_update_account")
+run_wizard = _lz(".wizard", "run_wizard")
+cache_latest_result = _lz("..core.jobs", "cache_latest_result")
+config_checklist = _lz("..core.jobs", "config_checklist")
+doctor_report = _lz("..core.jobs", "doctor_report")
+ensure_config_confirmed = _lz("..core.jobs", "ensure_config_confirmed")
+get_cached_result = _lz("..core.jobs", "get_cached_result")
+mark_config_reviewed = _lz("..core.jobs", "mark_config_reviewed")
+run_jobs = _lz("..core.jobs", "run_jobs")
+should_offer_bind_interactive = _lz("..core.jobs", "should_offer_bind_interactive")
+billing_analyze = _lz("..flows.billing", "billing_analyze")
+billing_detect = _lz("..flows.billing", "billing_detect")
+billing_month = _lz("..flows.billing", "billing_month")
+agenda = _lz("..flows.calendar", "agenda")
+calendar_event = _lz("..flows.calendar", "calendar_event")
+inbox_ingest_day = _lz("..flows.ingest", "inbox_ingest_day")
+inbox_poll = _lz("..flows.ingest", "inbox_poll")
+inbox_read = _lz("..flows.ingest", "inbox_read")
+analysis_list = _lz("..flows.analysis", "analysis_list")
+analysis_record = _lz("..flows.analysis", "analysis_record")
+reply_auto = _lz("..flows.reply", "reply_auto")
+reply_center = _lz("..flows.reply", "reply_center")
+reply_compose = _lz("..flows.reply", "reply_compose")
+reply_prepare = _lz("..flows.reply", "reply_prepare")
+reply_revise = _lz("..flows.reply", "reply_revise")
+reply_send = _lz("..flows.reply", "reply_send")
+reply_sent_list = _lz("..flows.reply", "reply_sent_list")
+reply_suggested_list = _lz("..flows.reply", "reply_suggested_list")
+send_queue_list = _lz("..flows.reply", "send_queue_list")
+send_queue_send_all = _lz("..flows.reply", "send_queue_send_all")
+send_queue_send_one = _lz("..flows.reply", "send_queue_send_one")
+daily_summary = _lz("..flows.summary", "daily_summary")
+triage_day = _lz("..flows.triage", "triage_day")
+triage_suggest = _lz("..flows.triage", "triage_suggest")
 
 
 app = typer.Typer(
@@ -89,16 +110,38 @@ app = typer.Typer(
         "Run `mailhub <entrypoint> --help` for detailed options."
     ),
 )
-console = Console()
+# Set once the first-run confirmation check passes; confirmation is never revoked mid-process.
+_CONFIRMED = False
+# Sub-Typer groups are collected here and mounted by `_mount_groups()` at module end
+# (full tree on import, narrowed to the invoked group by `entry.main()`).
+_GROUPS: Dict[str, typer.Typer] = {}
 configure_logging()
 logger = get_logger(__name__)
 
 
 def _require_first_run_confirmation() -> None:
+    global _CONFIRMED
+    if _CONFIRMED:
+        return
     pre = ensure_config_confirmed(confirm_config=False)
     if pre and not pre.get("ok", False):
-        console.print(pre)
+        _emit(pre)
         raise typer.Exit(code=2)
+    _CONFIRMED = True
+
+
+@functools.lru_cache(maxsize=64)
+def _load_message_json(raw: str) -> Any:
+    return jsoncodec.loads(raw)
+
+
+def _parse_message(raw: str) -> Dict[str, Any]:
+    """Parse a `--message` JSON object; parses are memoized per raw string for re-entrant callers."""
+    parsed = _load_message_json(raw)
+    if not isinstance(parsed, dict):
+        raise typer.BadParameter("--message must be a JSON object.")
+    # Hand out a copy so downstream edits never leak into the cached parse.
+    return dict(parsed)
 
 
 def _print_std_error(exc: Exception, stage: str) -> None:
@@ -122,7 +165,7 @@ def _print_std_error(exc: Exception, stage: str) -> None:
         error_type=exc.__class__.__name__,
         message=msg,
     )
-    console.print(payload)
+    _emit(payload)
     raise typer.Exit(code=1)
 
 
@@ -135,6 +178,9 @@ def _backend_display_label(name: str) -> str:
 
 
 def _healthcheck_db_cipher(settings: Settings, backend: str, local_dbkey_path) -> Dict[str, Any]:
+    from ..core.store import DB
+    from ..shared.time import utc_now_iso
+
     key = read_dbkey(
         backend=backend,
         state_dir=settings.state_dir,
@@ -153,7 +199,7 @@ def _healthcheck_db_cipher(settings: Settings, backend: str, local_dbkey_path) -
 
 def _prompt_dbkey_backend_choice(available_backends: List[str]) -> str:
     mapping = {str(i + 1): b for i, b in enumerate(available_backends)}
-    console.print("[bold]Select dbkey storage backend[/bold]")
+    _emit("[bold]Select dbkey storage backend[/bold]")
     for i, b in enumerate(available_backends, start=1):
         if b == BACKEND_LOCAL:
             suffix = " (lower security if whole state dir leaks)"
@@ -161,20 +207,23 @@ def _prompt_dbkey_backend_choice(available_backends: List[str]) -> str:
             suffix = " (recommended)"
         else:
             suffix = ""
-        console.print(f"{i}) {_backend_display_label(b)}{suffix}")
+        _emit(f"{i}) {_backend_display_label(b)}{suffix}")
     choice = typer.prompt("Select", default="1").strip()
     return mapping.get(choice, available_backends[0])
 
 
 def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
+    from rich.panel import Panel
+    from rich.table import Table
+
     ok = bool(report.get("ok"))
     title = "MailHub Doctor: PASS" if ok else "MailHub Doctor: FAIL"
     style = "green" if ok else "red"
-    console.print(Panel.fit(title, style=style))
+    _console().print(Panel.fit(title, style=style))
 
     v = report.get("version", {})
     mode = report.get("settings", {}).get("mode", "")
-    console.print(
+    _console().print(
         f"[bold]Version[/bold] mailhub={v.get('mailhub','')} python={v.get('python','')} mode={mode}"
     )
 
@@ -188,7 +237,7 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
         status = "[green]OK[/green]" if c_ok else "[red]FAIL[/red]"
         details = c.get("error") or c.get("backend") or ""
         t.add_row(str(c.get("name") or ""), status, str(details))
-    console.print(t)
+    _console().print(t)
 
     dbkey_backend = report.get("settings", {}).get("dbkey_backend", "")
     detection = report.get("settings", {}).get("dbkey_detection", {}) or {}
@@ -215,14 +264,14 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
             if full:
                 row.append(str(item.get("evidence") or ""))
             dt.add_row(*row)
-        console.print(dt)
+        _console().print(dt)
         if dbkey_backend == BACKEND_LOCAL:
-            console.print(
+            _console().print(
                 "[bold yellow]WARNING:[/bold yellow] local dbkey backend is selected; if the whole state directory leaks, offline decryption cannot be prevented."
             )
 
     providers = report.get("providers", {}) or {}
-    console.print(
+    _console().print(
         f"[bold]Providers[/bold] total={providers.get('total',0)} by_kind={providers.get('by_kind',{})}"
     )
 
@@ -232,7 +281,7 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
         wt.add_column("Warning", style="yellow")
         for w in warnings:
             wt.add_row(str(w))
-        console.print(wt)
+        _console().print(wt)
 
     errors = report.get("errors", []) or []
     if errors:
@@ -240,7 +289,7 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
         et.add_column("Error", style="red")
         for e in errors:
             et.add_row(str(e))
-        console.print(et)
+        _console().print(et)
 
     if full:
         db_stats = report.get("db_stats", {})
@@ -249,7 +298,7 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
         st.add_column("Rows", justify="right")
         for name, count in (db_stats or {}).items():
             st.add_row(str(name), str(count))
-        console.print(st)
+        _console().print(st)
         if providers.get("items"):
             pt = Table(title="Provider Accounts", show_header=True, header_style="bold")
             pt.add_column("ID")
@@ -263,7 +312,7 @@ def _render_doctor(report: Dict[str, Any], *, full: bool) -> None:
                     str(item.get("alias") or ""),
                     str(item.get("email") or ""),
                 )
-            console.print(pt)
+            _console().print(pt)
 
 
 def _normalize_section(raw: str) -> str:
@@ -297,7 +346,7 @@ def _prompt_bool(label: str, default: bool = True) -> bool:
 
 
 def _menu_select(title: str, options: Dict[str, str], *, default: str) -> str:
-    console.print(title)
+    _console().print(title)
     resolved: Dict[str, str] = {}
     for k, label in options.items():
         token = label
@@ -308,7 +357,7 @@ def _menu_select(title: str, options: Dict[str, str], *, default: str) -> str:
             view = view.strip()
         resolved[k] = token
         resolved[token.lower()] = token
-        console.print(f"{k}) {view}")
+        _console().print(f"{k}) {view}")
     choice = typer.prompt("Select", default=default).strip().lower()
     return resolved.get(choice, "")
 
@@ -316,7 +365,7 @@ def _menu_select(title: str, options: Dict[str, str], *, default: str) -> str:
 def _require_tty_for_interactive(entrypoint: str) -> None:
     if sys.stdin.isatty():
         return
-    console.print(
+    _emit(
         {
             "ok": False,
             "reason": "interactive_tty_required",
@@ -379,6 +428,8 @@ def _run_summary(*, include_mail: bool, include_calendar: bool, datetime_range_r
     out["window"] = {"start_utc": start_utc, "end_utc": end_utc}
 
     if include_mail:
+        from ..core.store import DB
+
         s = Settings.load()
         db = DB(s.db_path)
         db.init()
@@ -449,7 +500,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             default="1",
         )
         if not action:
-            console.print({"ok": False, "reason": "invalid_action"})
+            _emit({"ok": False, "reason": "invalid_action"})
             continue
         if action == "exit":
             return {"ok": True, "history": history}
@@ -463,7 +514,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                 if out["bind"].get("bound"):
                     out["after_bind"] = run_jobs(since=since)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "inbox_poll":
@@ -471,14 +522,14 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             mode = typer.prompt("Mode (alerts|jobs)", default="alerts").strip() or "alerts"
             out = inbox_poll(since=since, mode=mode)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "inbox_ingest":
             date = typer.prompt("Date (today|YYYY-MM-DD)", default="today").strip() or "today"
             out = inbox_ingest_day(date=date)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "inbox_read":
@@ -486,7 +537,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             include_raw = _prompt_bool("Include raw payload", default=False)
             out = inbox_read(message_id=message_id, include_raw=include_raw)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_compose":
@@ -499,7 +550,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             if mode == "back":
                 continue
             if not mode:
-                console.print({"ok": False, "reason": "invalid_compose_mode"})
+                _emit({"ok": False, "reason": "invalid_compose_mode"})
                 continue
             content = ""
             if mode in ("optimize", "raw"):
@@ -507,7 +558,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             review = _prompt_bool("Interactive review loop", default=True)
             out = reply_compose(message_id=message_id, mode=mode, content=content, review=review)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_auto":
@@ -516,7 +567,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             dry_run = _prompt_bool("Dry run", default=dry_run_default)
             out = reply_auto(since=since, dry_run=dry_run)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "send_queue":
@@ -536,13 +587,13 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                 limit = int(typer.prompt("List limit", default="200").strip() or "200")
                 out = send_queue_list(limit=limit)
                 history.append({"action": "send_queue.list", "result": out})
-                console.print(out)
+                _emit(out)
                 continue
             if send_action == "send_all":
                 limit = int(typer.prompt("Send-all limit", default="200").strip() or "200")
                 out = send_queue_send_all(confirm=True, limit=limit, bypass_message=True)
                 history.append({"action": "send_queue.send_all", "result": out})
-                console.print(out)
+                _emit(out)
                 continue
             if send_action == "send_one":
                 reply_id = int(typer.prompt("Reply queue id").strip())
@@ -554,7 +605,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                     if not context:
                         out = {"ok": False, "reason": "message_context_required"}
                         history.append({"action": "send_queue.send_one", "result": out})
-                        console.print(out)
+                        _emit(out)
                         continue
                     payload = {"context": context}
                     subject = typer.prompt("Subject (optional)", default="").strip()
@@ -574,16 +625,16 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                     bypass_message=bypass,
                 )
                 history.append({"action": "send_queue.send_one", "result": out})
-                console.print(out)
+                _emit(out)
                 continue
-            console.print({"ok": False, "reason": "invalid_send_action"})
+            _emit({"ok": False, "reason": "invalid_send_action"})
             continue
 
         if action == "reply_center":
             date = typer.prompt("Date (today|YYYY-MM-DD)", default="today").strip() or "today"
             out = reply_center(date=date)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_prepare":
@@ -595,7 +646,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                 idx = int(typer.prompt("Pending index (1-based)", default="1").strip() or "1")
                 out = reply_prepare(index=idx)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_revise":
@@ -610,7 +661,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             content = typer.prompt("Content / instruction", default="").strip()
             out = reply_revise(reply_id=rid, mode=mode, content=content)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_send":
@@ -624,7 +675,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                 if not context:
                     out = {"ok": False, "reason": "message_context_required"}
                     history.append({"action": action, "result": out})
-                    console.print(out)
+                    _emit(out)
                     continue
                 payload = {"context": context}
                 subject = typer.prompt("Subject (optional)", default="").strip()
@@ -643,7 +694,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
                 bypass_message=bypass,
             )
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_sent_list":
@@ -651,7 +702,7 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             limit = int(typer.prompt("Limit", default="50").strip() or "50")
             out = reply_sent_list(date=date, limit=limit)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
         if action == "reply_suggested_list":
@@ -659,10 +710,10 @@ def _mail_standalone_interactive() -> Dict[str, Any]:
             limit = int(typer.prompt("Limit", default="50").strip() or "50")
             out = reply_suggested_list(date=date, limit=limit)
             history.append({"action": action, "result": out})
-            console.print(out)
+            _emit(out)
             continue
 
-        console.print({"ok": False, "reason": "unsupported_action"})
+        _emit({"ok": False, "reason": "unsupported_action"})
 
 
 def _calendar_standalone_interactive() -> Dict[str, Any]:
@@ -682,7 +733,7 @@ def _calendar_standalone_interactive() -> Dict[str, Any]:
             default="1",
         )
         if not action:
-            console.print({"ok": False, "reason": "invalid_action"})
+            _emit({"ok": False, "reason": "invalid_action"})
             continue
         if action == "exit":
             return {"ok": True, "history": history}
@@ -725,7 +776,7 @@ def _calendar_standalone_interactive() -> Dict[str, Any]:
         out = calendar_event(**kwargs)
         cache_latest_result("calendar", out)
         history.append({"action": action, "result": out})
-        console.print(out)
+        _emit(out)
 
 
 def _summary_standalone_interactive() -> Dict[str, Any]:
@@ -742,7 +793,7 @@ def _summary_standalone_interactive() -> Dict[str, Any]:
             default="3",
         )
         if not scope:
-            console.print({"ok": False, "reason": "invalid_scope"})
+            _emit({"ok": False, "reason": "invalid_scope"})
             continue
         if scope == "exit":
             return {"ok": True, "history": history}
@@ -757,7 +808,7 @@ def _summary_standalone_interactive() -> Dict[str, Any]:
         )
         cache_latest_result("summary", out)
         history.append({"scope": scope, "result": out})
-        console.print(out)
+        _emit(out)
 
 
 def _openclaw_human_summary(section: str, result: Dict[str, Any], *, source: str) -> str:
@@ -851,17 +902,17 @@ def dbkey_setup_cmd(
     local_dbkey_path = default_local_dbkey_path(s.state_dir, s.security.dbkey_local_path)
     checks = detect_backends(state_dir=s.state_dir, local_dbkey_path=local_dbkey_path)
     if sys.stdin.isatty() and not non_interactive:
-        console.print("[bold]dbkey backend detection[/bold]")
+        _emit("[bold]dbkey backend detection[/bold]")
         for b in (BACKEND_KEYCHAIN, BACKEND_SYSTEMD):
             chk = checks[b]
             state = "[green]available[/green]" if chk.available else "[yellow]unavailable[/yellow]"
-            console.print(f"- {_backend_display_label(b)}: {state} - {chk.reason}")
+            _emit(f"- {_backend_display_label(b)}: {state} - {chk.reason}")
             if chk.suggestion:
-                console.print(f"  hint: {chk.suggestion}")
+                _emit(f"  hint: {chk.suggestion}")
 
     requested = normalize_backend(backend)
     if backend and not requested:
-        console.print({"ok": False, "reason": "invalid_backend", "backend": backend})
+        _emit({"ok": False, "reason": "invalid_backend", "backend": backend})
         raise typer.Exit(code=2)
 
     if requested:
@@ -878,7 +929,7 @@ def dbkey_setup_cmd(
 
     selected_check = checks.get(selected)
     if not selected_check or not selected_check.available:
-        console.print(
+        _emit(
             {
                 "ok": False,
                 "reason": "backend_not_available",
@@ -918,7 +969,7 @@ def dbkey_setup_cmd(
                 local_dbkey_path=local_dbkey_path,
                 keychain_account=s.effective_dbkey_keychain_account(),
             )
-        console.print(
+        _emit(
             {
                 "ok": False,
                 "reason": "dbkey_setup_failed",
@@ -957,7 +1008,7 @@ def dbkey_setup_cmd(
             else ""
         ),
     }
-    console.print(out)
+    _emit(out)
 
 
 @app.command("doctor")
@@ -975,26 +1026,27 @@ def config_cmd(
     wizard: bool = typer.Option(False, "--wizard", help="Open interactive settings wizard."),
 ):
     """Review or confirm first-run settings, optionally with wizard prompts."""
-    console.print(mark_config_reviewed())
-    if wizard:
-        run_wizard()
+    _emit(mark_config_reviewed())
+    if wizard and not run_wizard().get("ok"):
+        raise typer.Exit(code=2)
     if confirm:
         confirm_result = ensure_config_confirmed(confirm_config=True)
         if confirm_result:
-            console.print(confirm_result)
-    console.print(config_checklist(Settings.load()))
+            _emit(confirm_result)
+    _emit(config_checklist(Settings.load()))
 
 
 @app.command("wizard")
 def wizard_cmd():
     """Open interactive settings wizard."""
-    run_wizard()
+    if not run_wizard().get("ok"):
+        raise typer.Exit(code=2)
 
 
 @app.command("daily_summary")
 def daily_summary_cmd(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(daily_summary(date=date))
+    _emit(daily_summary(date=date))
 
 
 @app.command("summary")
@@ -1033,7 +1085,7 @@ def summary_cmd(
         datetime_range_raw=datetime_range_raw,
     )
     cache_latest_result("summary", out)
-    console.print(out)
+    _emit(out)
 
 
 @app.command("openclaw")
@@ -1074,7 +1126,7 @@ def openclaw_cmd(
     sec = _normalize_section(section)
     if not sec:
         if not sys.stdin.isatty():
-            console.print(
+            _emit(
                 {
                     "ok": False,
                     "reason": "section_required",
@@ -1084,15 +1136,15 @@ def openclaw_cmd(
             )
             raise typer.Exit(code=2)
         choices = {"1": "bind", "2": "mail", "3": "calendar", "4": "summary"}
-        console.print("1) bind")
-        console.print("2) mail")
-        console.print("3) calendar")
-        console.print("4) summary")
+        _emit("1) bind")
+        _emit("2) mail")
+        _emit("3) calendar")
+        _emit("4) summary")
         choice = typer.prompt("Select interface", default="2").strip().lower()
         sec = choices.get(choice, _normalize_section(choice))
 
     if not sec:
-        console.print(
+        _emit(
             {
                 "ok": False,
                 "reason": "invalid_section",
@@ -1110,7 +1162,7 @@ def openclaw_cmd(
     if mode == "standalone" and not refresh and sec != "bind":
         cached = get_cached_result(sec)
         if not cached.get("ok"):
-            console.print(
+            _emit(
                 {
                     "ok": False,
                     "mode": mode,
@@ -1123,7 +1175,7 @@ def openclaw_cmd(
         cached_obj = cached.get("cached") or {}
         payload = cached_obj.get("payload") if isinstance(cached_obj, dict) else cached_obj
         updated_at = str(cached_obj.get("updated_at") or "") if isinstance(cached_obj, dict) else ""
-        console.print(
+        _emit(
             {
                 "ok": True,
                 "mode": mode,
@@ -1146,7 +1198,7 @@ def openclaw_cmd(
         bind_if_needed=bind_if_needed,
     )
     source = "immediate_execution"
-    console.print(
+    _emit(
         {
             "ok": bool(out.get("ok", True)),
             "mode": mode,
@@ -1183,15 +1235,15 @@ def bind_cmd(
     """Unified account binding and account-capability management."""
     pre = ensure_config_confirmed(confirm_config=confirm_config)
     if pre and not pre.get("ok", False):
-        console.print(pre)
+        _emit(pre)
         raise typer.Exit(code=2)
     if pre and pre.get("ok"):
-        console.print(pre)
+        _emit(pre)
     if list_accounts:
-        console.print(bind_list())
+        _emit(bind_list())
         return
     if account_id:
-        console.print(
+        _emit(
             bind_update_account(
                 account_id=account_id,
                 alias=alias,
@@ -1203,7 +1255,7 @@ def bind_cmd(
         return
     if provider:
         try:
-            console.print(
+            _emit(
                 bind_provider(
                     provider=provider,
                     scopes=scopes,
@@ -1227,17 +1279,19 @@ def bind_cmd(
             _print_std_error(exc, "bind")
         return
     try:
-        console.print(bind_menu())
+        _emit(bind_menu())
     except Exception as exc:
         _print_std_error(exc, "bind")
 
 
-auth_app = typer.Typer(help="Direct provider auth commands (advanced/fallback path).")
-app.add_typer(auth_app, name="auth")
+auth_app = typer.Typer(help=group_help("auth"))
+_GROUPS["auth"] = auth_app
 
 
 @auth_app.command("google")
 def _auth_google(scopes: str = "gmail,calendar,contacts", code: str = ""):
+    from ..connectors.providers.google_gmail import auth_google
+
     _require_first_run_confirmation()
     Settings.load().ensure_dirs()
     try:
@@ -1248,6 +1302,8 @@ def _auth_google(scopes: str = "gmail,calendar,contacts", code: str = ""):
 
 @auth_app.command("microsoft")
 def _auth_ms(scopes: str = "mail,calendar,contacts"):
+    from ..connectors.providers.ms_graph import auth_microsoft
+
     _require_first_run_confirmation()
     Settings.load().ensure_dirs()
     auth_microsoft(scopes=scopes)
@@ -1255,6 +1311,8 @@ def _auth_ms(scopes: str = "mail,calendar,contacts"):
 
 @auth_app.command("imap")
 def _auth_imap(email: str, imap_host: str, smtp_host: str):
+    from ..connectors.providers.imap_smtp import auth_imap
+
     _require_first_run_confirmation()
     Settings.load().ensure_dirs()
     auth_imap(email=email, imap_host=imap_host, smtp_host=smtp_host)
@@ -1262,6 +1320,8 @@ def _auth_imap(email: str, imap_host: str, smtp_host: str):
 
 @auth_app.command("caldav")
 def _auth_caldav(username: str, host: str):
+    from ..connectors.providers.caldav import auth_caldav
+
     _require_first_run_confirmation()
     Settings.load().ensure_dirs()
     auth_caldav(username=username, host=host)
@@ -1269,25 +1329,27 @@ def _auth_caldav(username: str, host: str):
 
 @auth_app.command("carddav")
 def _auth_carddav(username: str, host: str):
+    from ..connectors.providers.carddav import auth_carddav
+
     _require_first_run_confirmation()
     Settings.load().ensure_dirs()
     auth_carddav(username=username, host=host)
 
 
-inbox_app = typer.Typer(help="Inbox polling and ingestion commands.")
-app.add_typer(inbox_app, name="inbox")
+inbox_app = typer.Typer(help=group_help("inbox"))
+_GROUPS["inbox"] = inbox_app
 
 
 @inbox_app.command("poll")
 def _poll(since: str = "15m", mode: str = "alerts"):
     _require_first_run_confirmation()
-    console.print(inbox_poll(since=since, mode=mode))
+    _emit(inbox_poll(since=since, mode=mode))
 
 
 @inbox_app.command("ingest")
 def _ingest(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(inbox_ingest_day(date=date))
+    _emit(inbox_ingest_day(date=date))
 
 
 @inbox_app.command("read")
@@ -1297,27 +1359,27 @@ def _read(
 ):
     """Read full content of one stored email by MailHub message id."""
     _require_first_run_confirmation()
-    console.print(inbox_read(message_id=message_id, include_raw=include_raw))
+    _emit(inbox_read(message_id=message_id, include_raw=include_raw))
 
 
-triage_app = typer.Typer(help="Classification and reply-needed triage commands.")
-app.add_typer(triage_app, name="triage")
+triage_app = typer.Typer(help=group_help("triage"))
+_GROUPS["triage"] = triage_app
 
 
 @triage_app.command("day")
 def _triage_day(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(triage_day(date=date))
+    _emit(triage_day(date=date))
 
 
 @triage_app.command("suggest")
 def _triage_suggest(since: str = "15m"):
     _require_first_run_confirmation()
-    console.print(triage_suggest(since=since))
+    _emit(triage_suggest(since=since))
 
 
-reply_app = typer.Typer(help="Reply draft/send/list commands.")
-app.add_typer(reply_app, name="reply")
+reply_app = typer.Typer(help=group_help("reply"))
+_GROUPS["reply"] = reply_app
 
 
 @reply_app.command("prepare")
@@ -1327,7 +1389,7 @@ def _reply_prepare(
 ):
     """Prepare reply draft by ID (preferred) or index fallback."""
     _require_first_run_confirmation()
-    console.print(reply_prepare(index=index, reply_id=reply_id))
+    _emit(reply_prepare(index=index, reply_id=reply_id))
 
 
 @reply_app.command("compose")
@@ -1339,7 +1401,7 @@ def _reply_compose(
 ):
     """Create draft from message id (auto/optimize/raw) with optional review loop."""
     _require_first_run_confirmation()
-    console.print(reply_compose(message_id=message_id, mode=mode, content=content, review=review))
+    _emit(reply_compose(message_id=message_id, mode=mode, content=content, review=review))
 
 
 @reply_app.command("revise")
@@ -1350,7 +1412,7 @@ def _reply_revise(
 ):
     """Revise an existing pending draft by reply queue id."""
     _require_first_run_confirmation()
-    console.print(reply_revise(reply_id=reply_id, mode=mode, content=content))
+    _emit(reply_revise(reply_id=reply_id, mode=mode, content=content))
 
 
 @reply_app.command("send")
@@ -1374,13 +1436,10 @@ def _reply_send(
     _require_first_run_confirmation()
     message_payload: Dict[str, Any] | None = None
     if message:
-        parsed = json.loads(message)
-        if not isinstance(parsed, dict):
-            raise typer.BadParameter("--message must be a JSON object.")
-        message_payload = parsed
+        message_payload = _parse_message(message)
     if message_payload and bypass_message:
         raise typer.BadParameter("Do not use --message and --bypass-message together.")
-    console.print(
+    _emit(
         reply_send(
             index=index,
             reply_id=reply_id,
@@ -1394,37 +1453,33 @@ def _reply_send(
 @reply_app.command("auto")
 def _reply_auto(since: str = "15m", dry_run: bool = True):
     _require_first_run_confirmation()
-    console.print(reply_auto(since=since, dry_run=dry_run))
+    _emit(reply_auto(since=since, dry_run=dry_run))
 
 
 @reply_app.command("sent-list")
 def _reply_sent_list(date: str = "today", limit: int = 50):
     _require_first_run_confirmation()
-    console.print(reply_sent_list(date=date, limit=limit))
+    _emit(reply_sent_list(date=date, limit=limit))
 
 
 @reply_app.command("suggested-list")
 def _reply_suggested_list(date: str = "today", limit: int = 50):
     _require_first_run_confirmation()
-    console.print(reply_suggested_list(date=date, limit=limit))
+    _emit(reply_suggested_list(date=date, limit=limit))
 
 
 @reply_app.command("center")
 def _reply_center(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(reply_center(date=date))
+    _emit(reply_center(date=date))
 
 
 mail_app = typer.Typer(
-    help=(
-        "Mail entrypoint.\n"
-        "- standalone mode: `mailhub mail` starts interactive menu.\n"
-        "- openclaw mode: use subcommands directly (run/inbox/reply)."
-    ),
+    help=group_help("mail"),
     invoke_without_command=True,
     no_args_is_help=False,
 )
-app.add_typer(mail_app, name="mail")
+_GROUPS["mail"] = mail_app
 
 mail_inbox_app = typer.Typer(help="Mail inbox operations.")
 mail_reply_app = typer.Typer(help="Mail reply operations.")
@@ -1452,7 +1507,7 @@ def _mail_root(ctx: typer.Context):
         _require_tty_for_interactive("mail")
         _mail_standalone_interactive()
         raise typer.Exit(code=0)
-    console.print(ctx.get_help())
+    _emit(ctx.get_help())
     raise typer.Exit(code=0)
 
 
@@ -1465,16 +1520,16 @@ def _mail_run(
     """Unified mail workflow (poll/triage/daily summary + optional alerts/auto-reply/scheduled tasks)."""
     pre = ensure_config_confirmed(confirm_config=confirm_config)
     if pre and not pre.get("ok", False):
-        console.print(pre)
+        _emit(pre)
         raise typer.Exit(code=2)
     if pre and pre.get("ok"):
-        console.print(pre)
+        _emit(pre)
     out = run_jobs(since=since)
     if bind_if_needed and should_offer_bind_interactive(out):
         out["bind"] = bind_menu()
         if out["bind"].get("bound"):
             out["after_bind"] = run_jobs(since=since)
-    console.print(out)
+    _emit(out)
 
 
 @mail_app.command("loop")
@@ -1500,7 +1555,7 @@ def _mail_loop(
     _require_first_run_confirmation()
     s = Settings.load()
     if s.effective_mode() != "standalone":
-        console.print(
+        _emit(
             {
                 "ok": False,
                 "reason": "standalone_mode_required",
@@ -1540,7 +1595,7 @@ def _mail_loop(
             duration_ms=duration_ms,
             step_count=len((out.get("steps") or {}).keys()),
         )
-        console.print(out)
+        _emit(out)
 
         run_count += 1
         if max_runs > 0 and run_count >= max_runs:
@@ -1551,13 +1606,13 @@ def _mail_loop(
 @mail_inbox_app.command("poll")
 def _mail_inbox_poll(since: str = "15m", mode: str = "alerts"):
     _require_first_run_confirmation()
-    console.print(inbox_poll(since=since, mode=mode))
+    _emit(inbox_poll(since=since, mode=mode))
 
 
 @mail_inbox_app.command("ingest")
 def _mail_inbox_ingest(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(inbox_ingest_day(date=date))
+    _emit(inbox_ingest_day(date=date))
 
 
 @mail_inbox_app.command("read")
@@ -1566,7 +1621,7 @@ def _mail_inbox_read(
     include_raw: bool = typer.Option(False, "--raw", help="Include raw JSON payload."),
 ):
     _require_first_run_confirmation()
-    console.print(inbox_read(message_id=message_id, include_raw=include_raw))
+    _emit(inbox_read(message_id=message_id, include_raw=include_raw))
 
 
 @mail_reply_app.command("prepare")
@@ -1575,7 +1630,7 @@ def _mail_reply_prepare(
     reply_id: int | None = typer.Option(None, "--id"),
 ):
     _require_first_run_confirmation()
-    console.print(reply_prepare(index=index, reply_id=reply_id))
+    _emit(reply_prepare(index=index, reply_id=reply_id))
 
 
 @mail_reply_app.command("compose")
@@ -1586,7 +1641,7 @@ def _mail_reply_compose(
     review: bool = typer.Option(True, "--review/--no-review"),
 ):
     _require_first_run_confirmation()
-    console.print(reply_compose(message_id=message_id, mode=mode, content=content, review=review))
+    _emit(reply_compose(message_id=message_id, mode=mode, content=content, review=review))
 
 
 @mail_reply_app.command("revise")
@@ -1596,7 +1651,7 @@ def _mail_reply_revise(
     content: str = typer.Option("", "--content"),
 ):
     _require_first_run_confirmation()
-    console.print(reply_revise(reply_id=reply_id, mode=mode, content=content))
+    _emit(reply_revise(reply_id=reply_id, mode=mode, content=content))
 
 
 @mail_reply_app.command("send")
@@ -1610,13 +1665,10 @@ def _mail_reply_send(
     _require_first_run_confirmation()
     message_payload: Dict[str, Any] | None = None
     if message:
-        parsed = json.loads(message)
-        if not isinstance(parsed, dict):
-            raise typer.BadParameter("--message must be a JSON object.")
-        message_payload = parsed
+        message_payload = _parse_message(message)
     if message_payload and bypass_message:
         raise typer.BadParameter("Do not use --message and --bypass-message together.")
-    console.print(
+    _emit(
         reply_send(
             index=index,
             reply_id=reply_id,
@@ -1630,37 +1682,33 @@ def _mail_reply_send(
 @mail_reply_app.command("center")
 def _mail_reply_center(date: str = "today"):
     _require_first_run_confirmation()
-    console.print(reply_center(date=date))
+    _emit(reply_center(date=date))
 
 
 @mail_reply_app.command("auto")
 def _mail_reply_auto(since: str = "15m", dry_run: bool = True):
     _require_first_run_confirmation()
-    console.print(reply_auto(since=since, dry_run=dry_run))
+    _emit(reply_auto(since=since, dry_run=dry_run))
 
 
 @mail_reply_app.command("sent-list")
 def _mail_reply_sent_list(date: str = "today", limit: int = 50):
     _require_first_run_confirmation()
-    console.print(reply_sent_list(date=date, limit=limit))
+    _emit(reply_sent_list(date=date, limit=limit))
 
 
 @mail_reply_app.command("suggested-list")
 def _mail_reply_suggested_list(date: str = "today", limit: int = 50):
     _require_first_run_confirmation()
-    console.print(reply_suggested_list(date=date, limit=limit))
+    _emit(reply_suggested_list(date=date, limit=limit))
 
 
 cal_app = typer.Typer(
-    help=(
-        "Calendar entrypoint.\n"
-        "- standalone mode: `mailhub calendar` starts interactive menu.\n"
-        "- openclaw mode: use `mailhub calendar --event ...` (or subcommands `event`, `agenda`)."
-    ),
+    help=group_help("calendar"),
     invoke_without_command=True,
     no_args_is_help=False,
 )
-app.add_typer(cal_app, name="calendar")
+_GROUPS["calendar"] = cal_app
 
 
 @cal_app.callback()
@@ -1689,7 +1737,7 @@ def _calendar_root(
         return
     if event.strip():
         _require_first_run_confirmation()
-        console.print(
+        _emit(
             calendar_event(
                 event=event,
                 datetime_raw=datetime_raw,
@@ -1710,14 +1758,14 @@ def _calendar_root(
         _require_tty_for_interactive("calendar")
         _calendar_standalone_interactive()
         raise typer.Exit(code=0)
-    console.print(ctx.get_help())
+    _emit(ctx.get_help())
     raise typer.Exit(code=0)
 
 
 @cal_app.command("agenda")
 def _agenda(days: int = 3):
     _require_first_run_confirmation()
-    console.print(agenda(days=days))
+    _emit(agenda(days=days))
 
 
 @cal_app.command("event")
@@ -1737,7 +1785,7 @@ def _calendar_event(
     duration_minutes: int = typer.Option(30, "--duration-minutes", help="Default duration for add when only --datetime is given."),
 ):
     _require_first_run_confirmation()
-    console.print(
+    _emit(
         calendar_event(
             event=event,
             datetime_raw=datetime_raw,
@@ -1752,30 +1800,30 @@ def _calendar_event(
     )
 
 
-billing_app = typer.Typer(help="Billing statement detection and analysis.")
-app.add_typer(billing_app, name="billing")
+billing_app = typer.Typer(help=group_help("billing"))
+_GROUPS["billing"] = billing_app
 
 
 @billing_app.command("detect")
 def _detect(since: str = "30d"):
     _require_first_run_confirmation()
-    console.print(billing_detect(since=since))
+    _emit(billing_detect(since=since))
 
 
 @billing_app.command("analyze")
 def _analyze(statement_id: str):
     _require_first_run_confirmation()
-    console.print(billing_analyze(statement_id=statement_id))
+    _emit(billing_analyze(statement_id=statement_id))
 
 
 @billing_app.command("month")
 def _month(month: str):
     _require_first_run_confirmation()
-    console.print(billing_month(month=month))
+    _emit(billing_month(month=month))
 
 
-analysis_app = typer.Typer(help="Persist and query analysis records.")
-app.add_typer(analysis_app, name="analysis")
+analysis_app = typer.Typer(help=group_help("analysis"))
+_GROUPS["analysis"] = analysis_app
 
 
 @analysis_app.command("record")
@@ -1789,7 +1837,7 @@ def analysis_record_cmd(
     source: str = typer.Option("openclaw", "--source"),
 ):
     _require_first_run_confirmation()
-    console.print(
+    _emit(
         analysis_record(
             message_id=message_id,
             title=title,
@@ -1805,7 +1853,7 @@ def analysis_record_cmd(
 @analysis_app.command("list")
 def analysis_list_cmd(date: str = "today", limit: int = 200):
     _require_first_run_confirmation()
-    console.print(analysis_list(date=date, limit=limit))
+    _emit(analysis_list(date=date, limit=limit))
 
 
 @app.command("send")
@@ -1831,23 +1879,20 @@ def send_cmd(
     try:
         message_payload: Dict[str, Any] | None = None
         if message:
-            parsed = json.loads(message)
-            if not isinstance(parsed, dict):
-                raise typer.BadParameter("--message must be a JSON object.")
-            message_payload = parsed
+            message_payload = _parse_message(message)
         if message_payload and bypass_message:
             raise typer.BadParameter("Do not use --message and --bypass-message together.")
 
         if list_ and message_payload:
             raise typer.BadParameter("--message is only supported with single `--id` send.")
         if list_ and confirm:
-            console.print(send_queue_send_all(confirm=True, limit=limit, bypass_message=bypass_message))
+            _emit(send_queue_send_all(confirm=True, limit=limit, bypass_message=bypass_message))
             return
         if list_:
-            console.print(send_queue_list(limit=limit))
+            _emit(send_queue_list(limit=limit))
             return
         if reply_id is not None:
-            console.print(
+            _emit(
                 send_queue_send_one(
                     reply_id=reply_id,
                     confirm=confirm,
@@ -1856,7 +1901,7 @@ def send_cmd(
                 )
             )
             return
-        console.print(send_queue_list(limit=limit))
+        _emit(send_queue_list(limit=limit))
     except Exception as exc:
         _print_std_error(exc, "send")
 
@@ -1865,16 +1910,14 @@ def send_cmd(
 def settings_show():
     """Print current effective settings snapshot."""
     s = Settings.load()
-    console.print(s.as_dict())
+    _emit(s.as_dict())
 
 
 @app.command("settings-set")
 def settings_set(key: str, value: str):
     """Set settings key. Supports: general.*, mail.*, calendar.*, summary.*, scheduler.*, oauth.*, runtime.*, routing.*."""
-    s = Settings.load()
     try:
-        canonical_key = s.set_setting_value(key, value)
-        resolved_value = s.get_setting_value(canonical_key)
+        canonical_key, resolved_value = Settings.patch(key, value)
     except ValueError as exc:
         raise typer.BadParameter(str(exc)) from exc
     except AttributeError as exc:
@@ -1882,5 +1925,30 @@ def settings_set(key: str, value: str):
     except TypeError as exc:
         raise typer.BadParameter(f"Invalid value for {key}: {value}") from exc
 
-    s.save()
-    console.print({"ok": True, "set": {key: resolved_value}, "canonical_key": canonical_key})
+    _emit({"ok": True, "set": {key: resolved_value}, "canonical_key": canonical_key})
+
+
+# Registration is complete; freeze the group table used for routing.
+_DISPATCH: Mapping[str, typer.Typer] = MappingProxyType(_GROUPS)
+
+
+def _mount_groups(argv: List[str]) -> None:
+    """
+    Mount sub-Typer groups on the root app, replacing any previous mount.
+    Typer converts every mounted group into click commands on each run, so when argv
+    names a known group or top-level command (`COMMAND_SPECS`) only the group actually
+    invoked is mounted. Help, completion and unknown tokens keep the full tree.
+    Importing this module mounts the full tree; the console script narrows it via `entry.main()`.
+    """
+    app.registered_groups = []
+    sniff = argv[1] if len(argv) > 1 else ""
+    if is_group(sniff):
+        app.add_typer(_DISPATCH[sniff], name=sniff)
+        return
+    if is_command(sniff):
+        return
+    for name, sub_app in _DISPATCH.items():
+        app.add_typer(sub_app, name=name)
+
+
+_mount_groups([])
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Dict
+
+# Root command table: name -> kind. Kept free of heavy imports so argv sniffing can consult
+# it without building the Typer tree. Top-level command help lives in the command docstrings.
+COMMAND_KIND = "command"
+GROUP_KIND = "group"
+
+COMMAND_SPECS: Dict[str, str] = {
+    "dbkey-setup": COMMAND_KIND,
+    "doctor": COMMAND_KIND,
+    "config": COMMAND_KIND,
+    "wizard": COMMAND_KIND,
+    "daily_summary": COMMAND_KIND,
+    "summary": COMMAND_KIND,
+    "openclaw": COMMAND_KIND,
+    "bind": COMMAND_KIND,
+    "send": COMMAND_KIND,
+    "settings-show": COMMAND_KIND,
+    "settings-set": COMMAND_KIND,
+    "auth": GROUP_KIND,
+    "inbox": GROUP_KIND,
+    "triage": GROUP_KIND,
+    "reply": GROUP_KIND,
+    "mail": GROUP_KIND,
+    "calendar": GROUP_KIND,
+    "billing": GROUP_KIND,
+    "analysis": GROUP_KIND,
+}
+
+# Sub-Typer group help, read by cli.py when the group apps are built.
+GROUP_HELP: Dict[str, str] = {
+    "auth": "Direct provider auth commands (advanced/fallback path).",
+    "inbox": "Inbox polling and ingestion commands.",
+    "triage": "Classification and reply-needed triage commands.",
+    "reply": "Reply draft/send/list commands.",
+    "mail": (
+        "Mail entrypoint.\n"
+        "- standalone mode: `mailhub mail` starts interactive menu.\n"
+        "- openclaw mode: use subcommands directly (run/inbox/reply)."
+    ),
+    "calendar": (
+        "Calendar entrypoint.\n"
+        "- standalone mode: `mailhub calendar` starts interactive menu.\n"
+        "- openclaw mode: use `mailhub calendar --event ...` (or subcommands `event`, `agenda`)."
+    ),
+    "billing": "Billing statement detection and analysis.",
+    "analysis": "Persist and query analysis records.",
+}
+
+
+def group_help(name: str) -> str:
+    return GROUP_HELP[name]
+
+
+def is_group(name: str) -> bool:
+    return COMMAND_SPECS.get(name) == GROUP_KIND
+
+
+def is_command(name: str) -> bool:
+    return COMMAND_SPECS.get(name) == COMMAND_KIND
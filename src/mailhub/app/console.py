@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+from ..shared import jsoncodec
+
+# Leaf module: console output shared by cli.py and wizard.py without either importing the other.
+_CONSOLE = None
+
+
+def get_console() -> Any:
+    """Process-wide Rich console, created on first use so JSON-only runs never import Rich."""
+    global _CONSOLE
+    if _CONSOLE is None:
+        from rich.console import Console
+
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
+def emit(obj: Any) -> None:
+    """
+    Print a command result.
+    Structured payloads go out as plain JSON when stdout is not a terminal, so scripts and
+    agents never pay for Rich; terminals keep the pretty-printed view.
+    """
+    if isinstance(obj, (dict, list)) and not sys.stdout.isatty():
+        sys.stdout.write(jsoncodec.dumps(obj, default=str) + "\n")
+        return
+    get_console().print(obj)
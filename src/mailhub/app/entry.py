@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import sys
+
+from .. import __version__
+
+
+def main() -> None:
+    """
+    Console-script entrypoint.
+    `--version`/`-V` is answered before Typer/Rich and the command tree are imported.
+    """
+    argv = sys.argv[1:]
+    if len(argv) == 1 and argv[0] in ("--version", "-V"):
+        print(__version__)
+        return
+    from . import cli
+
+    cli._mount_groups(sys.argv)
+    cli.app()
@@ -1,40 +1,106 @@
 from __future__ import annotations
 
 import getpass
+import json
 import os
+import sys
+from typing import Any, Dict, Iterator, Tuple
 
 import typer
-from rich.console import Console
 
 from .bind import bind_menu, bind_provider
+from .console import emit as _emit, get_console as _console
 from ..core.config import Settings
-
-app = typer.Typer()
-console = Console()
+from ..shared import jsoncodec
+from ..shared.time import utc_now_iso
 
 
 def run_wizard() -> dict:
     s = Settings.load()
     s.ensure_dirs()
-    _mark_reviewed(s)
+    # One timestamp for the whole run: reviewed/confirmed mark the same wizard session.
+    now = utc_now_iso()
+    _mark_reviewed(s, now)
+
+    if not sys.stdin.isatty():
+        return _run_batch_flow(s, now)
 
-    console.print("[bold]MailHub setup wizard[/bold]")
+    _console().print("[bold]MailHub setup wizard[/bold]")
     if not s.runtime.config_confirmed:
-        console.print(
+        _console().print(
             "[yellow]First-time setup detected.[/yellow] "
             "Using guided flow mode. Interactive section menu is available after first confirmation."
         )
-        _run_first_time_flow(s)
+        _run_first_time_flow(s, now)
     else:
-        _run_interactive_flow(s)
+        _run_interactive_flow(s, now)
 
     s.save()
     out = {"ok": True, "settings_path": str(s.settings_path), "config_confirmed": s.runtime.config_confirmed}
-    console.print(out)
+    _emit(out)
+    return out
+
+
+def _run_batch_flow(s: Settings, now: str) -> dict:
+    """
+    Non-interactive wizard: apply one JSON answers object read from stdin.
+    Keys are settings keys (`mail.poll_since`) or nested sections (`{"mail": {...}}`);
+    `"confirm": true` (a JSON boolean) marks the config confirmed. Account binding stays interactive-only.
+    """
+    raw = sys.stdin.read()
+    try:
+        answers = jsoncodec.loads(raw) if raw.strip() else {}
+    except json.JSONDecodeError as exc:
+        out = {"ok": False, "reason": "invalid_answers_json", "error": str(exc)}
+        _emit(out)
+        return out
+    if not isinstance(answers, dict):
+        out = {"ok": False, "reason": "answers_must_be_object"}
+        _emit(out)
+        return out
+
+    confirm = answers.pop("confirm", False)
+    # `s` is this call's own copy from Settings.load(), so a rejected batch is simply dropped
+    # (never saved, never visible to later loads).
+    applied: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    if not isinstance(confirm, bool):
+        errors["confirm"] = "confirm must be a JSON boolean"
+    for key, value in _flatten_answers(answers):
+        try:
+            path = s.set_setting_value(key, value)
+        except (AttributeError, TypeError, ValueError) as exc:
+            errors[key] = str(exc) or "unknown_key"
+            continue
+        applied[path] = s.get_setting_value(path)
+    if errors:
+        out = {"ok": False, "reason": "invalid_answers", "errors": errors}
+        _emit(out)
+        return out
+
+    if confirm is True:
+        _mark_confirmed(s, now)
+    s.save()
+    out = {
+        "ok": True,
+        "settings_path": str(s.settings_path),
+        "config_confirmed": s.runtime.config_confirmed,
+        "applied": applied,
+    }
+    _emit(out)
     return out
 
 
-def _run_first_time_flow(s: Settings) -> None:
+def _flatten_answers(data: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    for key, value in data.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten_answers(value, prefix=f"{dotted}.")
+        else:
+            yield dotted, value
+
+
+def _run_first_time_flow(s: Settings, now: str) -> None:
     _configure_general(s)
     _configure_routing(s)
     _configure_oauth(s)
@@ -47,23 +113,23 @@ def _run_first_time_flow(s: Settings) -> None:
         _configure_bind(s)
 
     if _prompt_bool("Confirm current config for execution?", default=True):
-        _mark_confirmed(s)
+        _mark_confirmed(s, now)
 
 
-def _run_interactive_flow(s: Settings) -> None:
+def _run_interactive_flow(s: Settings, now: str) -> None:
     while True:
-        console.print("")
-        console.print("Wizard sections")
-        console.print("1) routing/mode")
-        console.print("2) bind/accounts")
-        console.print("3) mail")
-        console.print("4) calendar")
-        console.print("5) summary")
-        console.print("6) scheduler")
-        console.print("7) oauth")
-        console.print("8) general")
-        console.print("9) confirm + finish")
-        console.print("0) finish")
+        _console().print("")
+        _console().print("Wizard sections")
+        _console().print("1) routing/mode")
+        _console().print("2) bind/accounts")
+        _console().print("3) mail")
+        _console().print("4) calendar")
+        _console().print("5) summary")
+        _console().print("6) scheduler")
+        _console().print("7) oauth")
+        _console().print("8) general")
+        _console().print("9) confirm + finish")
+        _console().print("0) finish")
         ch = typer.prompt("Select section", default="3").strip()
 
         if ch == "1":
@@ -91,12 +157,12 @@ def _run_interactive_flow(s: Settings) -> None:
             _configure_general(s)
             continue
         if ch == "9":
-            _mark_confirmed(s)
+            _mark_confirmed(s, now)
             break
         if ch == "0":
             break
 
-        console.print({"ok": False, "reason": "invalid_section_choice"})
+        _console().print({"ok": False, "reason": "invalid_section_choice"})
 
 
 def _configure_general(s: Settings) -> None:
@@ -125,7 +191,7 @@ def _configure_oauth(s: Settings) -> None:
         s.oauth.google_client_id = google_id
 
     if os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET", "").strip():
-        console.print("[dim]Using GOOGLE_OAUTH_CLIENT_SECRET from environment.[/dim]")
+        _console().print("[dim]Using GOOGLE_OAUTH_CLIENT_SECRET from environment.[/dim]")
     else:
         secret = getpass.getpass("Google OAuth Client Secret (hidden, blank keeps): ").strip()
         if secret:
@@ -253,27 +319,27 @@ def _configure_scheduler(s: Settings) -> None:
 
 def _configure_bind(s: Settings) -> None:
     while True:
-        console.print("")
-        console.print("Bind section")
-        console.print("1) Unified bind menu")
-        console.print("2) Google OAuth")
-        console.print("3) Google App Password (IMAP/SMTP)")
-        console.print("4) Microsoft OAuth")
-        console.print("5) IMAP/SMTP custom")
-        console.print("6) POP3/SMTP (not supported)")
-        console.print("0) Back")
+        _console().print("")
+        _console().print("Bind section")
+        _console().print("1) Unified bind menu")
+        _console().print("2) Google OAuth")
+        _console().print("3) Google App Password (IMAP/SMTP)")
+        _console().print("4) Microsoft OAuth")
+        _console().print("5) IMAP/SMTP custom")
+        _console().print("6) POP3/SMTP (not supported)")
+        _console().print("0) Back")
         ch = typer.prompt("Select bind option", default="1").strip()
 
         if ch == "0":
             return
         if ch == "1":
-            console.print(bind_menu())
+            _console().print(bind_menu())
             continue
         if ch == "2":
             alias = typer.prompt("Alias (optional)", default="")
             scopes = typer.prompt("Scopes", default="gmail,calendar,contacts")
             cold_start_days = _prompt_int("Cold start days", default=s.mail.fetch.default_cold_start_days, min_value=1)
-            console.print(
+            _console().print(
                 bind_provider(
                     provider="google",
                     alias=alias,
@@ -286,7 +352,7 @@ def _configure_bind(s: Settings) -> None:
             email = typer.prompt("Google email")
             alias = typer.prompt("Alias (optional)", default="")
             cold_start_days = _prompt_int("Cold start days", default=s.mail.fetch.default_cold_start_days, min_value=1)
-            console.print(
+            _console().print(
                 bind_provider(
                     provider="imap",
                     email=email,
@@ -301,7 +367,7 @@ def _configure_bind(s: Settings) -> None:
             alias = typer.prompt("Alias (optional)", default="")
             scopes = typer.prompt("Scopes", default="mail,calendar,contacts")
             cold_start_days = _prompt_int("Cold start days", default=s.mail.fetch.default_cold_start_days, min_value=1)
-            console.print(
+            _console().print(
                 bind_provider(
                     provider="microsoft",
                     alias=alias,
@@ -316,7 +382,7 @@ def _configure_bind(s: Settings) -> None:
             imap_host = typer.prompt("IMAP host", default="imap.gmail.com")
             smtp_host = typer.prompt("SMTP host", default="smtp.gmail.com")
             cold_start_days = _prompt_int("Cold start days", default=s.mail.fetch.default_cold_start_days, min_value=1)
-            console.print(
+            _console().print(
                 bind_provider(
                     provider="imap",
                     email=email,
@@ -328,7 +394,7 @@ def _configure_bind(s: Settings) -> None:
             )
             continue
         if ch == "6":
-            console.print(
+            _console().print(
                 {
                     "ok": False,
                     "reason": "unsupported_protocol",
@@ -337,7 +403,7 @@ def _configure_bind(s: Settings) -> None:
             )
             continue
 
-        console.print({"ok": False, "reason": "invalid_bind_choice"})
+        _console().print({"ok": False, "reason": "invalid_bind_choice"})
 
 
 def _prompt_bool(label: str, default: bool) -> bool:
@@ -354,22 +420,13 @@ def _prompt_int(label: str, *, default: int, min_value: int = 0) -> int:
     return max(min_value, v)
 
 
-def _mark_reviewed(s: Settings) -> None:
+def _mark_reviewed(s: Settings, now: str) -> None:
     if s.runtime.config_reviewed:
         return
-    from ..shared.time import utc_now_iso
-
     s.runtime.config_reviewed = True
-    s.runtime.config_reviewed_at = utc_now_iso()
+    s.runtime.config_reviewed_at = now
 
 
-def _mark_confirmed(s: Settings) -> None:
-    from ..shared.time import utc_now_iso
-
+def _mark_confirmed(s: Settings, now: str) -> None:
     s.runtime.config_confirmed = True
-    s.runtime.config_confirmed_at = utc_now_iso()
-
-
-@app.command("wizard")
-def wizard_cmd():
-    run_wizard()
+    s.runtime.config_confirmed_at = now
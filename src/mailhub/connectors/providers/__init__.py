@@ -1 +1,23 @@
 """Provider implementations (Google/Microsoft/IMAP/CalDAV/CardDAV)."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY = {
+    "caldav": ".caldav",
+    "carddav": ".carddav",
+    "google_gmail": ".google_gmail",
+    "imap_smtp": ".imap_smtp",
+    "ms_graph": ".ms_graph",
+}
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: load a provider submodule only when it is first referenced.
+    if name in _LAZY:
+        mod = importlib.import_module(_LAZY[name], __name__)
+        globals()[name] = mod
+        return mod
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
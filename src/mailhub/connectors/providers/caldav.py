@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import json
-import requests
 from dataclasses import dataclass
 
 from ...core.config import Settings
 from ...core.security import SecretStore
 from ...core.store import DB
+from ...shared import jsoncodec
 from ...shared.time import utc_now_iso
 
 
@@ -39,7 +38,7 @@ def auth_caldav(
         pid=pid,
         kind="caldav",
         email=None,
-        meta_json=json.dumps(
+        meta_json=jsoncodec.dumps(
             {
                 "username": username,
                 "host": host,
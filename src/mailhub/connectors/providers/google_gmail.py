@@ -338,8 +338,9 @@ def _refresh_if_needed(pid: str, store: SecretStore) -> str:
             raise RuntimeError("No access token available")
         return access
 
-    client_id = s.effective_google_client_id()
-    client_secret = s.effective_google_client_secret()
+    oauth = s.effective_oauth_dict()
+    client_id = oauth["GOOGLE_OAUTH_CLIENT_ID"]
+    client_secret = oauth["GOOGLE_OAUTH_CLIENT_SECRET"]
     if not client_id:
         raise RuntimeError("Missing Google OAuth client id (settings oauth.google_client_id or GOOGLE_OAUTH_CLIENT_ID env var)")
 
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import json
+import functools
 import os
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ...core.config import Settings
 from ...core.security import SecretStore
 from ...core.store import DB
+from ...shared import jsoncodec
 from ...shared.time import utc_now_iso, parse_since
 
 
@@ -17,26 +21,45 @@ AUTH_BASE = "https://login.microsoftonline.com/common/oauth2/v2.0"
 DEVICE_CODE_URL = f"{AUTH_BASE}/devicecode"
 TOKEN_URL = f"{AUTH_BASE}/token"
 GRAPH = "https://graph.microsoft.com/v1.0"
+BATCH_URL = f"{GRAPH}/$batch"
+BATCH_MAX_REQUESTS = 20  # Graph JSON batching limit per POST
+
+# Graph message projections: list pages carry the preview, hydration adds the body.
+_MSG_SELECT = "id,subject,from,toRecipients,receivedDateTime,bodyPreview,conversationId"
+_MSG_SELECT_FULL = _MSG_SELECT.replace("bodyPreview", "body,bodyPreview")
+
+# pid -> (access_token, expires_at epoch); saves two SecretStore reads per Graph call.
+_TOKEN_CACHE: Dict[str, Tuple[str, int]] = {}
+
+# Shared keep-alive pool for token refresh and all graph_* calls.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 SCOPE_MAP = {
-    "mail": ["Mail.Read", "Mail.Send"],
-    "calendar": ["Calendars.Read"],
-    "contacts": ["Contacts.Read"],
+    "mail": frozenset({"Mail.Read", "Mail.Send"}),
+    "calendar": frozenset({"Calendars.Read"}),
+    "contacts": frozenset({"Contacts.Read"}),
 }
+# MS requires "offline_access" for refresh token + "openid profile email"
+_BASE_SCOPES = frozenset({"offline_access", "openid", "profile", "email"})
+
+
+# Canonical scope set -> resolved scope string; at most 2^len(SCOPE_MAP) entries.
+_SCOPE_CACHE: Dict[frozenset[str], str] = {}
 
 
 def _build_scopes(scopes: str) -> str:
-    parts = [p.strip().lower() for p in scopes.split(",") if p.strip()]
-    if "all" in parts:
-        parts = list(SCOPE_MAP.keys())
-    s: List[str] = []
-    for p in parts:
-        s.extend(SCOPE_MAP.get(p, []))
-    if not s:
+    key = frozenset(p.strip().lower() for p in scopes.split(",") if p.strip())
+    if "all" in key:
+        key = frozenset(SCOPE_MAP)
+    key = key.intersection(SCOPE_MAP)
+    cached = _SCOPE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    if not key:
         raise ValueError("No valid scopes requested")
-    # MS requires "offline_access" for refresh token + "openid profile email"
-    s.extend(["offline_access", "openid", "profile", "email"])
-    return " ".join(sorted(set(s)))
+    resolved = _BASE_SCOPES.union(*(SCOPE_MAP[p] for p in key))
+    return _SCOPE_CACHE.setdefault(key, " ".join(sorted(resolved)))
 
 
 def auth_microsoft(
@@ -60,59 +83,69 @@ def auth_microsoft(
 
     scope_str = _build_scopes(scopes)
 
-    r = requests.post(DEVICE_CODE_URL, data={"client_id": client_id, "scope": scope_str}, timeout=30)
-    r.raise_for_status()
-    dc = r.json()
-
-    print("\nMicrosoft device login:")
-    print(dc["message"])
-    device_code = dc["device_code"]
-    interval = int(dc.get("interval", 5))
-    expires_in = int(dc.get("expires_in", 900))
-    start = time.time()
-
-    tok: Optional[Dict[str, Any]] = None
-    while time.time() - start < expires_in:
-        tr = requests.post(
-            TOKEN_URL,
-            data={
-                "client_id": client_id,
-                "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
-                "device_code": device_code,
-            },
-            timeout=30,
-        )
-        if tr.status_code == 200:
-            tok = tr.json()
-            break
-        # authorization_pending / slow_down are expected
-        time.sleep(interval)
-
-    if not tok:
-        raise TimeoutError("Timed out waiting for Microsoft device authorization")
-
-    access = tok["access_token"]
-    refresh = tok.get("refresh_token")
-    expires_in2 = int(tok.get("expires_in", 3600))
-    expires_at = int(time.time()) + expires_in2 - 30
-
-    # Get user profile
-    me = requests.get(f"{GRAPH}/me", headers={"Authorization": f"Bearer {access}"}, timeout=30)
-    me.raise_for_status()
-    email = me.json().get("mail") or me.json().get("userPrincipalName") or "me"
+    # One keep-alive session for the device-code request, the token polling loop and /me.
+    with requests.Session() as sess:
+        r = sess.post(DEVICE_CODE_URL, data={"client_id": client_id, "scope": scope_str}, timeout=30)
+        r.raise_for_status()
+        dc = r.json()
+
+        print("\nMicrosoft device login:")
+        print(dc["message"])
+        device_code = dc["device_code"]
+        interval = int(dc.get("interval", 5))
+        expires_in = int(dc.get("expires_in", 900))
+        start = time.time()
+
+        tok: Optional[Dict[str, Any]] = None
+        while time.time() - start < expires_in:
+            tr = sess.post(
+                TOKEN_URL,
+                data={
+                    "client_id": client_id,
+                    "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+                    "device_code": device_code,
+                },
+                timeout=30,
+            )
+            if tr.status_code == 200:
+                tok = tr.json()
+                break
+            # authorization_pending / slow_down are expected; slow_down asks for +5s per RFC 8628.
+            try:
+                err = str(tr.json().get("error") or "")
+            except (AttributeError, ValueError):
+                err = ""
+            if err == "slow_down":
+                interval += 5
+            time.sleep(interval)
+
+        if not tok:
+            raise TimeoutError("Timed out waiting for Microsoft device authorization")
+
+        access = tok["access_token"]
+        refresh = tok.get("refresh_token")
+        expires_in2 = int(tok.get("expires_in", 3600))
+        expires_at = int(time.time()) + expires_in2 - 30
+
+        # Get user profile
+        me = sess.get(f"{GRAPH}/me", headers={"Authorization": f"Bearer {access}"}, timeout=30)
+        me.raise_for_status()
+        profile = me.json()
+    email = profile.get("mail") or profile.get("userPrincipalName") or "me"
     pid = f"microsoft:{email}"
 
-    store = SecretStore(s.db_path)
+    store = _secret_store_for(s.db_path)
     store.set(f"{pid}:access_token", access)
     if refresh:
         store.set(f"{pid}:refresh_token", refresh)
     store.set(f"{pid}:expires_at", str(expires_at))
+    _TOKEN_CACHE[pid] = (access, expires_at)
 
     db.upsert_provider(
         pid=pid,
         kind="microsoft",
         email=email,
-        meta_json=json.dumps(
+        meta_json=jsoncodec.dumps(
             {
                 "alias": alias.strip(),
                 "client_id": client_id,
@@ -133,10 +166,25 @@ def auth_microsoft(
     return pid
 
 
+def _secret_store() -> SecretStore:
+    # Settings.load() is mtime-cached; the store itself is shared per db path.
+    return _secret_store_for(Settings.load().db_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _secret_store_for(db_path: Path) -> SecretStore:
+    return SecretStore(db_path)
+
+
 def _refresh_if_needed(pid: str, store: SecretStore) -> str:
+    cached = _TOKEN_CACHE.get(pid)
+    if cached and cached[1] > int(time.time()):
+        return cached[0]
+
     access = store.get(f"{pid}:access_token")
     exp = store.get(f"{pid}:expires_at")
     if access and exp and int(exp) > int(time.time()):
+        _TOKEN_CACHE[pid] = (access, int(exp))
         return access
 
     refresh = store.get(f"{pid}:refresh_token")
@@ -149,7 +197,7 @@ def _refresh_if_needed(pid: str, store: SecretStore) -> str:
     if not client_id:
         raise RuntimeError("Missing Microsoft OAuth client id (settings oauth.ms_client_id or MS_OAUTH_CLIENT_ID env var)")
 
-    tr = requests.post(
+    tr = _SESSION.post(
         TOKEN_URL,
         data={
             "client_id": client_id,
@@ -168,9 +216,17 @@ def _refresh_if_needed(pid: str, store: SecretStore) -> str:
     store.set(f"{pid}:expires_at", str(expires_at))
     if tok.get("refresh_token"):
         store.set(f"{pid}:refresh_token", tok["refresh_token"])
+    _TOKEN_CACHE[pid] = (access_token, expires_at)
     return access_token
 
 
+def _raise_for_status(r: requests.Response, pid: str) -> None:
+    # A 401 means the cached token was revoked early; drop it so the next call refreshes.
+    if r.status_code == 401:
+        _TOKEN_CACHE.pop(pid, None)
+    r.raise_for_status()
+
+
 def graph_list_recent_messages(
     since: str = "15m",
     top: int = 25,
@@ -181,65 +237,146 @@ def graph_list_recent_messages(
     include_next: bool = False,
 ) -> List[Dict[str, Any]] | Dict[str, Any]:
     s = Settings.load()
-    db = DB(s.db_path)
-    db.init()
-    providers = [p for p in db.list_providers() if p["kind"] == "microsoft"]
-    if provider_id.strip():
-        providers = [p for p in providers if p["id"] == provider_id.strip()]
+    providers = _microsoft_providers(s, provider_id)
     if not providers:
         return {"items": [], "next_page_url": ""} if include_next else []
 
     dt = (after_iso.strip() or parse_since(since).isoformat())
-    store = SecretStore(s.db_path)
+    store = _secret_store_for(s.db_path)
     out: List[Dict[str, Any]] = []
     next_page_url = ""
 
-    for p in providers:
-        pid = p["id"]
-        access = _refresh_if_needed(pid, store)
-        if page_url.strip():
-            r = requests.get(
-                page_url.strip(),
-                headers={"Authorization": f"Bearer {access}"},
-                timeout=30,
-            )
-        else:
-            r = requests.get(
-                f"{GRAPH}/me/mailFolders/Inbox/messages",
-                params={
-                    "$top": top,
-                    "$orderby": "receivedDateTime desc",
-                    "$filter": f"receivedDateTime ge {dt}",
-                    "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview,conversationId",
-                },
-                headers={"Authorization": f"Bearer {access}"},
-                timeout=30,
-            )
-        r.raise_for_status()
-        body = r.json()
-        next_page_url = str(body.get("@odata.nextLink") or "")
-        for m in body.get("value", []):
-            out.append({"provider_id": pid, "graph_id": m["id"], "raw": m})
+    def _fetch(p: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+        return _fetch_provider_page(p["id"], store, page_url=page_url, top=top, dt=dt)
+
+    # Providers are independent HTTPS round-trips; overlap them. map() keeps provider order,
+    # so items and the trailing next_page_url match the sequential behaviour.
+    if len(providers) == 1:
+        pages = [_fetch(providers[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(providers))) as pool:
+            pages = list(pool.map(_fetch, providers))
+    for items, next_page_url in pages:
+        out.extend(items)
     if include_next:
         return {"items": out, "next_page_url": next_page_url}
     return out
 
 
+def graph_iter_recent_messages(
+    since: str = "15m",
+    top: int = 25,
+    *,
+    provider_id: str = "",
+    after_iso: str = "",
+    max_pages: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield inbox messages one at a time, following `@odata.nextLink` per provider.
+    `max_pages` caps pages per provider (0 = until exhausted). Only one page is held in memory.
+    """
+    s = Settings.load()
+    dt = (after_iso.strip() or parse_since(since).isoformat())
+    store = _secret_store_for(s.db_path)
+    for p in _microsoft_providers(s, provider_id):
+        next_url = ""
+        pages = 0
+        while True:
+            items, next_url = _fetch_provider_page(p["id"], store, page_url=next_url, top=top, dt=dt)
+            yield from items
+            pages += 1
+            if not next_url or not items or (max_pages and pages >= max_pages):
+                break
+
+
+def _microsoft_providers(s: Settings, provider_id: str = "") -> List[Dict[str, Any]]:
+    db = DB(s.db_path)
+    db.init()
+    providers = [p for p in db.list_providers() if p["kind"] == "microsoft"]
+    if provider_id.strip():
+        providers = [p for p in providers if p["id"] == provider_id.strip()]
+    return providers
+
+
+def _fetch_provider_page(
+    pid: str, store: SecretStore, *, page_url: str, top: int, dt: str
+) -> Tuple[List[Dict[str, Any]], str]:
+    access = _refresh_if_needed(pid, store)
+    hdr = {"Authorization": f"Bearer {access}"}
+    if page_url.strip():
+        r = _SESSION.get(page_url.strip(), headers=hdr, timeout=30)
+    else:
+        r = _SESSION.get(
+            f"{GRAPH}/me/mailFolders/Inbox/messages",
+            params={
+                "$top": top,
+                "$orderby": "receivedDateTime desc",
+                "$filter": f"receivedDateTime ge {dt}",
+                "$select": _MSG_SELECT,
+            },
+            headers=hdr,
+            timeout=30,
+        )
+    _raise_for_status(r, pid)
+    body = r.json()
+    items = [{"provider_id": pid, "graph_id": m["id"], "raw": m} for m in body.get("value", [])]
+    return items, str(body.get("@odata.nextLink") or "")
+
+
 def graph_get_message(provider_id: str, graph_id: str) -> Dict[str, Any]:
-    store = SecretStore(Settings.load().db_path)
+    store = _secret_store()
     access = _refresh_if_needed(provider_id, store)
-    r = requests.get(
+    r = _SESSION.get(
         f"{GRAPH}/me/messages/{graph_id}",
-        params={"$select": "id,subject,from,toRecipients,receivedDateTime,body,bodyPreview,conversationId"},
+        params={"$select": _MSG_SELECT_FULL},
         headers={"Authorization": f"Bearer {access}"},
         timeout=30,
     )
-    r.raise_for_status()
+    _raise_for_status(r, provider_id)
     return r.json()
 
 
+def graph_get_messages(provider_id: str, graph_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch many messages through Graph `$batch` (20 per POST), returned in input order.
+    A failed sub-request raises HTTPError carrying that sub-request's status, so callers'
+    rate-limit backoff treats it like a single GET failure.
+    """
+    if not graph_ids:
+        return []
+    store = _secret_store()
+    access = _refresh_if_needed(provider_id, store)
+    out: List[Dict[str, Any]] = []
+    for start in range(0, len(graph_ids), BATCH_MAX_REQUESTS):
+        chunk = graph_ids[start : start + BATCH_MAX_REQUESTS]
+        payload = {
+            "requests": [
+                {"id": str(i), "method": "GET", "url": f"/me/messages/{gid}?$select={_MSG_SELECT_FULL}"}
+                for i, gid in enumerate(chunk)
+            ]
+        }
+        r = _SESSION.post(
+            BATCH_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {access}"},
+            timeout=60,
+        )
+        _raise_for_status(r, provider_id)
+        by_id = {str(x.get("id")): x for x in r.json().get("responses", []) if isinstance(x, dict)}
+        for i, gid in enumerate(chunk):
+            item = by_id.get(str(i)) or {}
+            status = int(item.get("status") or 0)
+            if not 200 <= status < 300:
+                resp = requests.Response()
+                resp.status_code = status or 502
+                resp.url = f"{GRAPH}/me/messages/{gid}"
+                raise requests.HTTPError(f"Graph batch request failed: status={status} id={gid}", response=resp)
+            out.append(item.get("body") or {})
+    return out
+
+
 def graph_send_mail(provider_id: str, to_addr: str, subject: str, body_text: str) -> Dict[str, Any]:
-    store = SecretStore(Settings.load().db_path)
+    store = _secret_store()
     access = _refresh_if_needed(provider_id, store)
 
     payload = {
@@ -250,20 +387,20 @@ def graph_send_mail(provider_id: str, to_addr: str, subject: str, body_text: str
         },
         "saveToSentItems": True,
     }
-    r = requests.post(
+    r = _SESSION.post(
         f"{GRAPH}/me/sendMail",
         json=payload,
         headers={"Authorization": f"Bearer {access}"},
         timeout=30,
     )
-    r.raise_for_status()
+    _raise_for_status(r, provider_id)
     return {"ok": True}
 
 
 def graph_calendar_agenda(provider_id: str, time_min_iso: str, time_max_iso: str, top: int = 50) -> List[Dict[str, Any]]:
-    store = SecretStore(Settings.load().db_path)
+    store = _secret_store()
     access = _refresh_if_needed(provider_id, store)
-    r = requests.get(
+    r = _SESSION.get(
         f"{GRAPH}/me/calendarView",
         params={
             "startDateTime": time_min_iso,
@@ -274,10 +411,19 @@ def graph_calendar_agenda(provider_id: str, time_min_iso: str, time_max_iso: str
         headers={"Authorization": f"Bearer {access}"},
         timeout=30,
     )
-    r.raise_for_status()
+    _raise_for_status(r, provider_id)
     return r.json().get("value", [])
 
 
+def _strip_utc_suffix(iso: str) -> str:
+    # Graph DateTimeTimeZone expects dateTime without timezone suffix when timeZone is provided.
+    if iso.endswith("Z"):
+        return iso[:-1]
+    if iso.endswith("+00:00"):
+        return iso[:-6]
+    return iso
+
+
 def graph_calendar_create_event(
     provider_id: str,
     *,
@@ -287,11 +433,10 @@ def graph_calendar_create_event(
     location: str = "",
     body_text: str = "",
 ) -> Dict[str, Any]:
-    store = SecretStore(Settings.load().db_path)
+    store = _secret_store()
     access = _refresh_if_needed(provider_id, store)
-    # Graph DateTimeTimeZone expects dateTime without timezone suffix when timeZone is provided.
-    start_dt = start_utc_iso.replace("Z", "")
-    end_dt = end_utc_iso.replace("Z", "")
+    start_dt = _strip_utc_suffix(start_utc_iso)
+    end_dt = _strip_utc_suffix(end_utc_iso)
     payload: Dict[str, Any] = {
         "subject": subject.strip(),
         "start": {"dateTime": start_dt, "timeZone": "UTC"},
@@ -301,23 +446,23 @@ def graph_calendar_create_event(
         payload["location"] = {"displayName": location.strip()}
     if body_text.strip():
         payload["body"] = {"contentType": "Text", "content": body_text.strip()}
-    r = requests.post(
+    r = _SESSION.post(
         f"{GRAPH}/me/events",
         json=payload,
         headers={"Authorization": f"Bearer {access}"},
         timeout=30,
     )
-    r.raise_for_status()
+    _raise_for_status(r, provider_id)
     return r.json()
 
 
 def graph_calendar_delete_event(provider_id: str, event_id: str) -> Dict[str, Any]:
-    store = SecretStore(Settings.load().db_path)
+    store = _secret_store()
     access = _refresh_if_needed(provider_id, store)
-    r = requests.delete(
+    r = _SESSION.delete(
         f"{GRAPH}/me/events/{event_id}",
         headers={"Authorization": f"Bearer {access}"},
         timeout=30,
     )
-    r.raise_for_status()
+    _raise_for_status(r, provider_id)
     return {"ok": True, "provider_id": provider_id, "event_id": event_id}
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import itertools
 import os
+import re
+import select
 import shlex
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from ..shared import jsoncodec
 from .config import Settings
 
 
@@ -21,33 +28,44 @@ def agent_enabled() -> bool:
 def _prompt_text(name: str) -> str:
     s = Settings.load()
     p = s.resolve_skill_path(f"config/prompts/{name}")
-    if not p.exists():
+    try:
+        mtime_ns = p.stat().st_mtime_ns
+    except OSError:
         return ""
+    return _read_prompt(str(p), mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_prompt(path: str, mtime_ns: int) -> str:
+    # mtime_ns only keys the cache so edited prompt files are re-read.
     try:
-        return p.read_text(encoding="utf-8")
+        return Path(path).read_text(encoding="utf-8")
     except Exception:
         return ""
 
 
-def _extract_json(text: str) -> Optional[Dict[str, Any]]:
-    raw = (text or "").strip()
+# Lines that look like a whole JSON object; only these are materialised, not every line.
+_JSON_LINE_RE = re.compile(rb"^\s*(\{.*\})\s*?$", re.M)
+
+
+def _extract_json(out: bytes) -> Optional[Dict[str, Any]]:
+    # Agent stdout stays bytes end to end; the JSON decoder takes UTF-8 bytes directly.
+    raw = (out or b"").strip()
     if not raw:
         return None
     # Fast path
-    if raw.startswith("{") and raw.endswith("}"):
+    if raw.startswith(b"{") and raw.endswith(b"}"):
         try:
-            out = json.loads(raw)
+            out = jsoncodec.loads(raw)
             if isinstance(out, dict):
                 return out
         except Exception:
             pass
     # Best effort: parse the last json object line
-    lines = [ln.strip() for ln in raw.splitlines() if ln.strip()]
-    for ln in reversed(lines):
-        if not (ln.startswith("{") and ln.endswith("}")):
-            continue
+    candidates = [m.group(1) for m in _JSON_LINE_RE.finditer(raw)]
+    for ln in reversed(candidates):
         try:
-            out = json.loads(ln)
+            out = jsoncodec.loads(ln)
             if isinstance(out, dict):
                 return out
         except Exception:
@@ -55,16 +73,23 @@ def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+@functools.lru_cache(maxsize=16)
+def _argv_template(command: str, args: Tuple[str, ...] | str) -> Tuple[str, ...]:
+    # Tokenise once per runner config; placeholders stay literal until _build_cmd_from_models.
+    tail = tuple(shlex.split(args)) if isinstance(args, str) else args
+    return tuple(shlex.split(command)) + tail
+
+
 def _build_cmd_from_models(models: Dict[str, Any], *, openclaw_json_path: str) -> List[str]:
     runner = models.get("runner") if isinstance(models, dict) else {}
     runner = runner if isinstance(runner, dict) else {}
     command = str(runner.get("command") or "").strip()
     args_raw = runner.get("args", [])
-    args: List[str] = []
+    args: Tuple[str, ...] | str = ()
     if isinstance(args_raw, list):
-        args = [str(x) for x in args_raw]
+        args = tuple(str(x) for x in args_raw)
     elif isinstance(args_raw, str):
-        args = shlex.split(args_raw)
+        args = args_raw
 
     agent = models.get("agent") if isinstance(models, dict) else {}
     agent = agent if isinstance(agent, dict) else {}
@@ -79,13 +104,11 @@ def _build_cmd_from_models(models: Dict[str, Any], *, openclaw_json_path: str) -
         "openclaw_json_path": openclaw_json_path,
     }
 
-    head = shlex.split(command.format(**values))
-    out = list(head)
-    out.extend([a.format(**values) for a in args])
+    out = [t.format_map(values) if "{" in t else t for t in _argv_template(command, args)]
     return [x for x in out if x.strip()]
 
 
-def run_agent(task: str, payload: Dict[str, Any], prompt_file: str) -> Optional[Dict[str, Any]]:
+def _runner_context() -> Optional[Tuple[Settings, Dict[str, Any], List[str]]]:
     if not agent_enabled():
         return None
 
@@ -96,24 +119,176 @@ def run_agent(task: str, payload: Dict[str, Any], prompt_file: str) -> Optional[
     if not cmd_argv:
         # No runner configured in models file.
         return None
+    return s, models, cmd_argv
+
 
-    req = {
+def _request_envelope(s: Settings, models: Dict[str, Any], task: str, prompt_file: str) -> Dict[str, Any]:
+    return {
         "mode": s.effective_mode(),
         "task": task,
         "prompt": _prompt_text(prompt_file),
-        "input": payload,
         "openclaw_json_path": s.effective_openclaw_json_path(),
         "standalone_models_path": s.effective_standalone_models_path(),
         "models": models,
     }
 
+
+def _runner_flag(models: Dict[str, Any], name: str) -> bool:
+    runner = models.get("runner") if isinstance(models, dict) else {}
+    return isinstance(runner, dict) and runner.get(name) is True
+
+
+def _agent_timeout() -> int:
+    return int(os.environ.get("MAILHUB_AGENT_TIMEOUT", "45"))
+
+
+class _PersistentRunner:
+    """
+    Long-lived runner speaking newline-delimited JSON: one request line in, one JSON object
+    line out. Each request carries a `request_id` the reply must echo; stdout lines without
+    the matching id (logs, stray JSON) are skipped. Used when `runner.persistent: true`.
+    """
+
+    def __init__(self, cmd_argv: List[str]) -> None:
+        self._proc = subprocess.Popen(
+            cmd_argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        # Non-blocking stdin so a large request cannot stall past the deadline on a full pipe.
+        os.set_blocking(self._proc.stdin.fileno(), False)
+        self._buf = b""
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def _write(self, data: bytes, deadline: float) -> bool:
+        fd = self._proc.stdin.fileno()
+        view = memoryview(data)
+        while view:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _, ready, _ = select.select([], [fd], [], remaining)
+            if not ready:
+                return False
+            try:
+                view = view[os.write(fd, view):]
+            except BlockingIOError:
+                continue
+        return True
+
+    def _readline(self, deadline: float) -> Optional[bytes]:
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            self._buf += chunk
+        line, _, self._buf = self._buf.partition(b"\n")
+        return line
+
+    def send(self, req: Dict[str, Any], *, timeout: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            deadline = time.monotonic() + timeout
+            request_id = next(self._ids)
+            try:
+                if not self._write(jsoncodec.dumpb({**req, "request_id": request_id}) + b"\n", deadline):
+                    self.abort()
+                    return None
+                while True:
+                    line = self._readline(deadline)
+                    if line is None:
+                        # Timed out or runner exited; a half-answered runner cannot be reused.
+                        self.abort()
+                        return None
+                    out = _extract_json(line)
+                    if out is not None and out.get("request_id") == request_id:
+                        return out
+            except Exception:
+                self.abort()
+                return None
+
+    def abort(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+
+    def close(self) -> None:
+        if self._proc.poll() is not None:
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+        except Exception:
+            self._proc.kill()
+
+
+# Persistent runners keyed by argv; closed at interpreter exit.
+_PERSISTENT: Dict[Tuple[str, ...], _PersistentRunner] = {}
+_PERSISTENT_LOCK = threading.Lock()
+
+
+def _persistent_runner(cmd_argv: List[str]) -> _PersistentRunner:
+    key = tuple(cmd_argv)
+    with _PERSISTENT_LOCK:
+        runner = _PERSISTENT.get(key)
+        if runner is None or not runner.alive():
+            runner = _PersistentRunner(cmd_argv)
+            if not _PERSISTENT:
+                atexit.register(_close_persistent_runners)
+            _PERSISTENT[key] = runner
+        return runner
+
+
+def _close_persistent_runners() -> None:
+    with _PERSISTENT_LOCK:
+        for runner in _PERSISTENT.values():
+            runner.close()
+        _PERSISTENT.clear()
+
+
+def _encode_request(req: Dict[str, Any], models_raw: Optional[bytes]) -> bytes:
+    if models_raw is None:
+        return jsoncodec.dumpb(req)
+    # Splice the models file bytes in as-is instead of re-serialising the parsed copy.
+    head = jsoncodec.dumpb({k: v for k, v in req.items() if k != "models"})
+    return head[:-1] + b',"models":' + models_raw + b"}"
+
+
+def _exec_runner(
+    cmd_argv: List[str],
+    req: Dict[str, Any],
+    *,
+    items: int = 1,
+    persistent: bool = False,
+    models_raw: Optional[bytes] = None,
+) -> Optional[Dict[str, Any]]:
+    # select() on pipes is POSIX-only; Windows falls back to one spawn per request.
+    if persistent and os.name != "nt":
+        try:
+            runner = _persistent_runner(cmd_argv)
+        except Exception:
+            return None
+        # NDJSON framing needs a single line, so the (possibly pretty-printed) raw file is not spliced.
+        return runner.send(req, timeout=_agent_timeout() * max(1, items))
     try:
         cp = subprocess.run(
             cmd_argv,
-            input=json.dumps(req, ensure_ascii=False),
-            text=True,
-            capture_output=True,
-            timeout=int(os.environ.get("MAILHUB_AGENT_TIMEOUT", "45")),
+            input=_encode_request(req, models_raw),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=_agent_timeout() * max(1, items),
             check=False,
         )
     except Exception:
@@ -124,10 +299,66 @@ def run_agent(task: str, payload: Dict[str, Any], prompt_file: str) -> Optional[
     return _extract_json(cp.stdout)
 
 
+def run_agent(task: str, payload: Dict[str, Any], prompt_file: str) -> Optional[Dict[str, Any]]:
+    ctx = _runner_context()
+    if ctx is None:
+        return None
+    s, models, cmd_argv = ctx
+    req = _request_envelope(s, models, task, prompt_file)
+    req["input"] = payload
+    return _exec_runner(
+        cmd_argv,
+        req,
+        persistent=_runner_flag(models, "persistent"),
+        models_raw=s.load_standalone_models_bytes(),
+    )
+
+
+def run_agent_batch(
+    task: str, payloads: List[Dict[str, Any]], prompt_file: str
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Run one task over many inputs, returning one result (or None) per payload, in order.
+    Runners that set `runner.batch: true` get a single spawn with `{"batch": [...]}` on stdin and
+    must answer `{"results": [...]}`; other runners are invoked once per payload.
+    """
+    if not payloads:
+        return []
+    ctx = _runner_context()
+    if ctx is None:
+        return [None] * len(payloads)
+    s, models, cmd_argv = ctx
+    envelope = _request_envelope(s, models, task, prompt_file)
+    persistent = _runner_flag(models, "persistent")
+    models_raw = s.load_standalone_models_bytes()
+
+    if not _runner_flag(models, "batch"):
+        return [
+            _exec_runner(cmd_argv, {**envelope, "input": p}, persistent=persistent, models_raw=models_raw)
+            for p in payloads
+        ]
+
+    out = _exec_runner(
+        cmd_argv,
+        {**envelope, "batch": payloads},
+        items=len(payloads),
+        persistent=persistent,
+        models_raw=models_raw,
+    )
+    results = out.get("results") if out else None
+    if not isinstance(results, list) or len(results) != len(payloads):
+        return [None] * len(payloads)
+    return [r if isinstance(r, dict) else None for r in results]
+
+
 def classify_email_with_agent(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return run_agent("classify_email", payload, "classify_email.md")
 
 
+def classify_emails_with_agent(payloads: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    return run_agent_batch("classify_email", payloads, "classify_email.md")
+
+
 def summarize_bucket_with_agent(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return run_agent("summarize_bucket", payload, "summarize_bucket.md")
 
@@ -1,28 +1,56 @@
 from __future__ import annotations
 
-import json
+import functools
+import operator
 import os
-from dataclasses import dataclass, asdict, field, fields
+import re
+import stat
+from dataclasses import MISSING, dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, Iterable
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Tuple
+
+from ..shared import jsoncodec
 
 DEFAULT_DISCLOSURE = "<This reply is auto-genertated by Mailhub skill>"
 
+# Boolean literals accepted by `settings-set` / `Settings.patch`.
+_TRUE = frozenset({"1", "true", "yes", "on", "y", "t"})
+_FALSE = frozenset({"0", "false", "no", "off", "n", "f"})
+
+# State dirs already prepared by `Settings.ensure_dirs()` in this process.
+_DIRS_READY: set[tuple[str, str]] = set()
+_OAUTH_ENV_FIELDS = (
+    ("GOOGLE_OAUTH_CLIENT_ID", "google_client_id"),
+    ("GOOGLE_OAUTH_CLIENT_SECRET", "google_client_secret"),
+    ("MS_OAUTH_CLIENT_ID", "ms_client_id"),
+)
+_MODES = ("openclaw", "standalone")
+_DBKEY_BACKENDS = ("keychain", "systemd", "local")
+_ENABLED_WORDS = ("1", "true", "yes", "on")
+
 
-@dataclass
+@functools.lru_cache(maxsize=64)
+def _normalize_choice(raw: str, allowed: Tuple[str, ...], fallback: str) -> str:
+    # effective_* accessors run per call site; memoise the strip/lower/validate per raw value.
+    v = raw.strip().lower()
+    return v if v in allowed else fallback
+
+
+@dataclass(slots=True)
 class GeneralConfig:
     agent_display_name: str = "MailHub"
     disclosure_line: str = DEFAULT_DISCLOSURE
 
 
-@dataclass
+@dataclass(slots=True)
 class MailBillingConfig:
     analysis_mode: str = "off"  # off|on
     days_of_month: str = "1"
     trigger_times_local: str = "10:00"
 
 
-@dataclass
+@dataclass(slots=True)
 class MailFetchConfig:
     default_cold_start_days: int = 30
     max_results_per_page: int = 50
@@ -33,7 +61,7 @@ class MailFetchConfig:
     backoff_max_seconds: int = 16
 
 
-@dataclass
+@dataclass(slots=True)
 class MailConfig:
     alerts_mode: str = "off"  # off|all|suggested
     scheduled_analysis: str = "off"  # off|daily|weekly
@@ -47,7 +75,7 @@ class MailConfig:
     billing: MailBillingConfig = field(default_factory=MailBillingConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class CalendarReminderConfig:
     enabled: bool = False
     in_jobs_run: bool = True
@@ -56,14 +84,14 @@ class CalendarReminderConfig:
     trigger_times_local: str = "09:00"
 
 
-@dataclass
+@dataclass(slots=True)
 class CalendarConfig:
     management_mode: str = "off"  # off|on
     days_window: int = 3
     reminder: CalendarReminderConfig = field(default_factory=CalendarReminderConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryConfig:
     enabled: bool = True
     in_jobs_run: bool = True
@@ -72,7 +100,7 @@ class SummaryConfig:
     trigger_times_local: str = "18:00"
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulerConfig:
     tz: str = "UTC"
     digest_weekdays: str = "mon,tue,wed,thu,fri"
@@ -80,7 +108,7 @@ class SchedulerConfig:
     standalone_loop_interval_seconds: int = 60
 
 
-@dataclass
+@dataclass(slots=True)
 class RuntimeFlags:
     config_reviewed: bool = False
     config_reviewed_at: str = ""
@@ -88,7 +116,7 @@ class RuntimeFlags:
     config_confirmed_at: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingConfig:
     # openclaw: rely on OpenClaw SKILL orchestration for reasoning
     # standalone: reasoning via local agent bridge command + prompts
@@ -98,21 +126,21 @@ class RoutingConfig:
     standalone_models_path: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class OAuthClientConfig:
     google_client_id: str = ""
     google_client_secret: str = ""
     ms_client_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     dbkey_backend: str = "local"  # keychain|systemd|local
     dbkey_keychain_account: str = "default"
     dbkey_local_path: str = "dbkey.enc"  # relative to state_dir by default
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     state_dir: Path
     db_path: Path
@@ -132,12 +160,33 @@ class Settings:
     def default_state_dir() -> Path:
         p = os.environ.get("MAILHUB_STATE_DIR")
         if p:
-            return Path(os.path.expandvars(p)).expanduser()
+            return expand_path(p)
         # fallback
         return Path.home() / ".openclaw" / "state" / "mailhub"
 
     @classmethod
     def load(cls) -> "Settings":
+        """
+        Return the parsed settings, cached per process.
+        The cache is keyed on settings.json path + mtime, so external edits and `save()`
+        are picked up. Each call returns its own copy of the cached parse: changes that are
+        never saved (a rejected wizard batch, a dry run) stay with that caller and do not
+        leak into later loads.
+        """
+        settings_path = cls.default_state_dir() / "settings.json"
+        try:
+            mtime_ns = settings_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        return _copy_dataclass(_cached_load(str(settings_path), mtime_ns))
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drop the cached `load()` result; the next call re-reads settings.json."""
+        _cached_load.cache_clear()
+
+    @classmethod
+    def _load_impl(cls) -> "Settings":
         state_dir = cls.default_state_dir()
         settings_path = state_dir / "settings.json"
         db_path = state_dir / "mailhub.sqlite"
@@ -151,13 +200,15 @@ class Settings:
         security = SecurityConfig()
         runtime = RuntimeFlags()
         routing = RoutingConfig()
-        if settings_path.exists():
-            data = json.loads(settings_path.read_text(encoding="utf-8"))
+        try:
+            raw: bytes | None = settings_path.read_bytes()
+        except FileNotFoundError:
+            raw = None
+        if raw is not None:
+            data = jsoncodec.loads(raw)
             g = data.get("general", {})
             if isinstance(g, dict):
-                general = GeneralConfig(
-                    **{**asdict(general), **_filter_dataclass_kwargs(GeneralConfig, g)}
-                )
+                general = GeneralConfig(**_filter_dataclass_kwargs(GeneralConfig, g))
             m = data.get("mail", {})
             if isinstance(m, dict):
                 mf = mail.fetch
@@ -165,18 +216,11 @@ class Settings:
                 f = m.get("fetch", {})
                 b = m.get("billing", {})
                 if isinstance(f, dict):
-                    mf = MailFetchConfig(
-                        **{**asdict(mf), **_filter_dataclass_kwargs(MailFetchConfig, f)}
-                    )
+                    mf = MailFetchConfig(**_filter_dataclass_kwargs(MailFetchConfig, f))
                 if isinstance(b, dict):
-                    mb = MailBillingConfig(
-                        **{**asdict(mb), **_filter_dataclass_kwargs(MailBillingConfig, b)}
-                    )
+                    mb = MailBillingConfig(**_filter_dataclass_kwargs(MailBillingConfig, b))
                 mail = MailConfig(
-                    **{
-                        **asdict(mail),
-                        **_filter_dataclass_kwargs(MailConfig, m, exclude=("fetch", "billing")),
-                    },
+                    **_filter_dataclass_kwargs(MailConfig, m, exclude=("fetch", "billing")),
                     fetch=mf,
                     billing=mb,
                 )
@@ -185,42 +229,25 @@ class Settings:
                 cr = calendar.reminder
                 r = c.get("reminder", {})
                 if isinstance(r, dict):
-                    cr = CalendarReminderConfig(
-                        **{**asdict(cr), **_filter_dataclass_kwargs(CalendarReminderConfig, r)}
-                    )
+                    cr = CalendarReminderConfig(**_filter_dataclass_kwargs(CalendarReminderConfig, r))
                 calendar = CalendarConfig(
-                    **{
-                        **asdict(calendar),
-                        **_filter_dataclass_kwargs(CalendarConfig, c, exclude=("reminder",)),
-                    },
+                    **_filter_dataclass_kwargs(CalendarConfig, c, exclude=("reminder",)),
                     reminder=cr,
                 )
             sm = data.get("summary", {})
             if isinstance(sm, dict):
-                summary = SummaryConfig(
-                    **{**asdict(summary), **_filter_dataclass_kwargs(SummaryConfig, sm)}
-                )
+                summary = SummaryConfig(**_filter_dataclass_kwargs(SummaryConfig, sm))
             sc = data.get("scheduler", {})
             if isinstance(sc, dict):
-                scheduler = SchedulerConfig(
-                    **{**asdict(scheduler), **_filter_dataclass_kwargs(SchedulerConfig, sc)}
-                )
+                scheduler = SchedulerConfig(**_filter_dataclass_kwargs(SchedulerConfig, sc))
             o = data.get("oauth", {})
-            oauth = OAuthClientConfig(
-                **{**asdict(oauth), **_filter_dataclass_kwargs(OAuthClientConfig, o)}
-            )
+            oauth = OAuthClientConfig(**_filter_dataclass_kwargs(OAuthClientConfig, o))
             sec = data.get("security", {})
-            security = SecurityConfig(
-                **{**asdict(security), **_filter_dataclass_kwargs(SecurityConfig, sec)}
-            )
+            security = SecurityConfig(**_filter_dataclass_kwargs(SecurityConfig, sec))
             r = data.get("runtime", {})
-            runtime = RuntimeFlags(
-                **{**asdict(runtime), **_filter_dataclass_kwargs(RuntimeFlags, r)}
-            )
+            runtime = RuntimeFlags(**_filter_dataclass_kwargs(RuntimeFlags, r))
             rt = data.get("routing", {})
-            routing = RoutingConfig(
-                **{**asdict(routing), **_filter_dataclass_kwargs(RoutingConfig, rt)}
-            )
+            routing = RoutingConfig(**_filter_dataclass_kwargs(RoutingConfig, rt))
 
         return cls(
             state_dir=state_dir,
@@ -238,25 +265,39 @@ class Settings:
         )
 
     def ensure_dirs(self) -> None:
+        # Once per (state_dir, models path) per process; repeated auth/save calls skip the
+        # mkdir/chmod/stat work, while a re-pointed standalone models path is still prepared.
+        key = (str(self.state_dir), self.effective_standalone_models_path())
+        if key in _DIRS_READY:
+            return
         self.state_dir.mkdir(parents=True, exist_ok=True)
         _restrict_private_path(self.state_dir, is_dir=True)
         self._ensure_standalone_models_files()
+        _DIRS_READY.add(key)
 
     def save(self) -> None:
         self.ensure_dirs()
         payload: Dict[str, Any] = {
-            "general": asdict(self.general),
-            "mail": asdict(self.mail),
-            "calendar": asdict(self.calendar),
-            "summary": asdict(self.summary),
-            "scheduler": asdict(self.scheduler),
-            "oauth": asdict(self.oauth),
-            "security": asdict(self.security),
-            "runtime": asdict(self.runtime),
-            "routing": asdict(self.routing),
+            "general": _to_plain(self.general),
+            "mail": _to_plain(self.mail),
+            "calendar": _to_plain(self.calendar),
+            "summary": _to_plain(self.summary),
+            "scheduler": _to_plain(self.scheduler),
+            "oauth": _to_plain(self.oauth),
+            "security": _to_plain(self.security),
+            "runtime": _to_plain(self.runtime),
+            "routing": _to_plain(self.routing),
         }
-        self.settings_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        data = jsoncodec.dumps(payload, indent=True).encode("utf-8")
+        try:
+            if self.settings_path.read_bytes() == data:
+                # No-op save: skip the rewrite so the mtime-keyed load cache stays warm.
+                return
+        except OSError:
+            pass
+        self.settings_path.write_bytes(data)
         _restrict_private_path(self.settings_path, is_dir=False)
+        self.invalidate_cache()
 
     def disclosure_text(self) -> str:
         return self.general.disclosure_line.replace(
@@ -268,22 +309,19 @@ class Settings:
             "state_dir": str(self.state_dir),
             "db_path": str(self.db_path),
             "settings_path": str(self.settings_path),
-            "general": asdict(self.general),
-            "mail": asdict(self.mail),
-            "calendar": asdict(self.calendar),
-            "summary": asdict(self.summary),
-            "scheduler": asdict(self.scheduler),
-            "oauth": asdict(self.oauth),
-            "security": asdict(self.security),
-            "runtime": asdict(self.runtime),
-            "routing": asdict(self.routing),
+            "general": _to_plain(self.general),
+            "mail": _to_plain(self.mail),
+            "calendar": _to_plain(self.calendar),
+            "summary": _to_plain(self.summary),
+            "scheduler": _to_plain(self.scheduler),
+            "oauth": _to_plain(self.oauth),
+            "security": _to_plain(self.security),
+            "runtime": _to_plain(self.runtime),
+            "routing": _to_plain(self.routing),
         }
 
     def effective_dbkey_backend(self) -> str:
-        v = (self.security.dbkey_backend or "local").strip().lower()
-        if v in ("keychain", "systemd", "local"):
-            return v
-        return "local"
+        return _normalize_choice(self.security.dbkey_backend or "local", _DBKEY_BACKENDS, "local")
 
     def effective_dbkey_keychain_account(self) -> str:
         v = (self.security.dbkey_keychain_account or "default").strip()
@@ -291,7 +329,7 @@ class Settings:
 
     def effective_dbkey_local_path(self) -> Path:
         raw = (self.security.dbkey_local_path or "dbkey.enc").strip()
-        p = Path(os.path.expandvars(raw)).expanduser()
+        p = expand_path(raw)
         if p.is_absolute():
             return p
         return self.state_dir / p
@@ -304,37 +342,55 @@ class Settings:
 
     def set_setting_value(self, key: str, value: Any) -> str:
         path = self.resolve_setting_key(key)
-        cur = _get_path_value(self, path)
-        if isinstance(cur, bool):
-            if isinstance(value, str):
-                v = value.strip().lower()
-                if v in ("1", "true", "yes", "on"):
-                    value = True
-                elif v in ("0", "false", "no", "off"):
-                    value = False
-                else:
-                    raise ValueError(f"Invalid boolean value: {value}")
-            else:
-                value = bool(value)
-        elif isinstance(cur, int):
+        if path not in _PATH_ACCESSORS:
+            # Sections (e.g. `mail.fetch`) would otherwise be coerced into a plain string.
             try:
-                value = int(value)
-            except Exception as exc:
-                raise ValueError(f"Invalid integer value: {value}") from exc
-        else:
-            value = str(value)
-        _set_path_value(self, path, value)
+                _schema_default(path)
+            except AttributeError:
+                raise AttributeError(f"Unknown settings key: {path}") from None
+            raise ValueError(f"Not a leaf settings key: {path}")
+        cur = _get_path_value(self, path)
+        _set_path_value(self, path, _coerce_setting_value(cur, value))
         return path
 
+    @classmethod
+    def patch(cls, key: str, value: Any) -> Tuple[str, Any]:
+        """
+        Set one settings key by editing settings.json as a plain dict.
+        Coercion follows the schema default's type, so no Settings object is built;
+        a missing settings file falls back to a full load/save to seed every section.
+        """
+        path = resolve_setting_key(key)
+        coerced = _coerce_setting_value(_schema_default(path), value)
+        settings_path = cls.default_state_dir() / "settings.json"
+        try:
+            data = settings_path.read_bytes()
+        except FileNotFoundError:
+            s = cls.load()
+            _set_path_value(s, path, coerced)
+            s.save()
+            return path, coerced
+
+        raw = jsoncodec.loads(data)
+        if not isinstance(raw, dict):
+            raw = {}
+        node = raw
+        parts = path.split(".")
+        for part in parts[:-1]:
+            nxt = node.get(part)
+            if not isinstance(nxt, dict):
+                nxt = node[part] = {}
+            node = nxt
+        node[parts[-1]] = coerced
+        settings_path.write_text(jsoncodec.dumps(raw, indent=True), encoding="utf-8")
+        _restrict_private_path(settings_path, is_dir=False)
+        cls.invalidate_cache()
+        return path, coerced
+
     def effective_mode(self) -> str:
-        v = (
-            (os.environ.get("MAILHUB_MODE") or self.routing.mode or "openclaw")
-            .strip()
-            .lower()
+        return _normalize_choice(
+            os.environ.get("MAILHUB_MODE") or self.routing.mode or "openclaw", _MODES, "openclaw"
         )
-        if v not in ("openclaw", "standalone"):
-            return "openclaw"
-        return v
 
     def effective_openclaw_json_path(self) -> str:
         return (
@@ -346,7 +402,7 @@ class Settings:
     def effective_standalone_agent_enabled(self) -> bool:
         raw = os.environ.get("MAILHUB_STANDALONE_AGENT_ENABLED", "")
         if raw.strip():
-            return raw.strip().lower() in ("1", "true", "yes", "on")
+            return _normalize_choice(raw, _ENABLED_WORDS, "") != ""
         return bool(self.routing.standalone_agent_enabled)
 
     def effective_standalone_models_path(self) -> str:
@@ -363,80 +419,80 @@ class Settings:
         skill_dir = (os.environ.get("MAILHUB_SKILL_DIR") or "").strip()
         if skill_dir:
             return str(
-                Path(os.path.expandvars(skill_dir)).expanduser()
+                expand_path(skill_dir)
                 / "template"
                 / "standalone.models.template.json"
             )
         return str(
-            Path(__file__).resolve().parents[3] / "template" / "standalone.models.template.json"
+            _source_root() / "template" / "standalone.models.template.json"
         )
 
     def effective_settings_template_path(self) -> str:
         skill_dir = (os.environ.get("MAILHUB_SKILL_DIR") or "").strip()
         if skill_dir:
             return str(
-                Path(os.path.expandvars(skill_dir)).expanduser()
+                expand_path(skill_dir)
                 / "template"
                 / "settings.template.json"
             )
         return str(
-            Path(__file__).resolve().parents[3] / "template" / "settings.template.json"
+            _source_root() / "template" / "settings.template.json"
         )
 
     def load_standalone_models(self) -> Dict[str, Any]:
-        p = Path(
-            os.path.expandvars(self.effective_standalone_models_path())
-        ).expanduser()
-        if not p.exists():
-            return {}
+        """Parsed models file, cached on path + mtime; treat the result as read-only."""
+        return self._standalone_models_entry()[1]
+
+    def load_standalone_models_bytes(self) -> bytes:
+        """Models file as JSON object bytes (`{}` when missing/invalid), for splicing into payloads."""
+        return self._standalone_models_entry()[0]
+
+    def _standalone_models_entry(self) -> Tuple[bytes, Dict[str, Any]]:
+        p = expand_path(self.effective_standalone_models_path())
         try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-        return data if isinstance(data, dict) else {}
+            mtime_ns = p.stat().st_mtime_ns
+        except OSError:
+            return _EMPTY_JSON_OBJECT
+        return _cached_json_object(str(p), mtime_ns)
 
     def _ensure_standalone_models_files(self) -> None:
-        p = Path(
-            os.path.expandvars(self.effective_standalone_models_path())
-        ).expanduser()
+        p = expand_path(self.effective_standalone_models_path())
         p.parent.mkdir(parents=True, exist_ok=True)
         _restrict_private_path(p.parent, is_dir=True)
-        if not p.exists():
-            p.write_text("{}", encoding="utf-8")
+        try:
+            with open(p, "x", encoding="utf-8") as fh:
+                fh.write("{}")
+        except FileExistsError:
+            pass
         _restrict_private_path(p, is_dir=False)
 
     def _dotenv_value(self, key: str) -> str:
-        # Priority: explicit env file -> cwd .env -> skill dir .env (if launcher exports) -> ""
-        candidates: list[Path] = []
-        env_file = (os.environ.get("MAILHUB_ENV_FILE") or "").strip()
-        if env_file:
-            candidates.append(Path(os.path.expandvars(env_file)).expanduser())
-        candidates.append(Path.cwd() / ".env")
-        skill_dir = (os.environ.get("MAILHUB_SKILL_DIR") or "").strip()
-        if skill_dir:
-            candidates.append(Path(os.path.expandvars(skill_dir)).expanduser() / ".env")
-
+        return self._dotenv_values((key,)).get(key, "")
+
+    def _dotenv_values(self, keys: Tuple[str, ...]) -> Dict[str, str]:
+        # Priority: explicit env file -> cwd .env -> skill dir .env (if launcher exports); first hit wins.
+        candidates = _dotenv_candidates(
+            (os.environ.get("MAILHUB_ENV_FILE") or "").strip(),
+            os.getcwd(),
+            (os.environ.get("MAILHUB_SKILL_DIR") or "").strip(),
+        )
+        out: Dict[str, str] = {}
         for p in candidates:
-            if not p.exists() or not p.is_file():
-                continue
-            try:
-                for line in p.read_text(encoding="utf-8").splitlines():
-                    raw = line.strip()
-                    if not raw or raw.startswith("#") or "=" not in raw:
-                        continue
-                    k, v = raw.split("=", 1)
-                    if k.strip() != key:
-                        continue
-                    val = v.strip()
-                    if len(val) >= 2 and (
-                        (val[0] == '"' and val[-1] == '"')
-                        or (val[0] == "'" and val[-1] == "'")
-                    ):
-                        val = val[1:-1]
-                    return val.strip()
-            except Exception:
-                continue
-        return ""
+            values = _load_dotenv(p)
+            for key in keys:
+                if key not in out and key in values:
+                    out[key] = values[key]
+            if len(out) == len(keys):
+                break
+        return out
+
+    def effective_oauth_dict(self) -> Dict[str, str]:
+        """All OAuth client values keyed by env var name (env -> .env -> settings), one .env pass."""
+        dotenv = self._dotenv_values(tuple(env for env, _ in _OAUTH_ENV_FIELDS))
+        return {
+            env: (os.environ.get(env) or dotenv.get(env) or getattr(self.oauth, attr) or "").strip()
+            for env, attr in _OAUTH_ENV_FIELDS
+        }
 
     def effective_google_client_id(self) -> str:
         return (
@@ -471,19 +527,143 @@ class Settings:
         """
         skill_dir = (os.environ.get("MAILHUB_SKILL_DIR") or "").strip()
         if skill_dir:
-            return Path(os.path.expandvars(skill_dir)).expanduser()
-        return Path(__file__).resolve().parents[3]
+            return expand_path(skill_dir)
+        return _source_root()
 
     def resolve_skill_path(self, relative_path: str) -> Path:
         return self.skill_root() / relative_path
 
 
+@functools.lru_cache(maxsize=64)
+def expand_path(raw: str) -> Path:
+    """`$VAR` and `~` expansion for configured paths, memoised per raw string."""
+    return Path(os.path.expandvars(raw)).expanduser()
+
+
+@functools.lru_cache(maxsize=1)
+def _source_root() -> Path:
+    return Path(__file__).resolve().parents[3]
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_load(settings_path: str, mtime_ns: int) -> Settings:
+    # Arguments only form the cache key; the loader re-resolves the path itself.
+    return Settings._load_impl()
+
+
+_EMPTY_JSON_OBJECT: Tuple[bytes, Dict[str, Any]] = (b"{}", {})
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_json_object(path: str, mtime_ns: int) -> Tuple[bytes, Dict[str, Any]]:
+    # (raw bytes, parsed dict); raw is only kept when it parsed as a JSON object.
+    try:
+        raw = Path(path).read_bytes()
+        data = jsoncodec.loads(raw)
+    except Exception:
+        return _EMPTY_JSON_OBJECT
+    return (raw, data) if isinstance(data, dict) else _EMPTY_JSON_OBJECT
+
+
+@functools.lru_cache(maxsize=8)
+def _dotenv_candidates(env_file: str, cwd: str, skill_dir: str) -> Tuple[Path, ...]:
+    candidates: list[Path] = []
+    if env_file:
+        candidates.append(expand_path(env_file))
+    candidates.append(Path(cwd) / ".env")
+    if skill_dir:
+        candidates.append(expand_path(skill_dir) / ".env")
+    return tuple(candidates)
+
+
+# KEY=value lines; blanks are [ \t] only so an empty value never swallows the next line.
+# Quoted values may carry a trailing `# comment`; unquoted values are taken verbatim.
+_DOTENV_RE = re.compile(
+    rb"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    rb"(?:\"([^\"\n]*)\"|'([^'\n]*)'|(.*?))[ \t\r]*(?(4)|(?:#[^\n]*)?)[ \t\r]*$",
+    re.M,
+)
+
+
+# Parsed .env files: path -> (mtime_ns, read-only key -> value view).
+_DOTENV_CACHE: Dict[str, Tuple[int, Mapping[str, str]]] = {}
+_EMPTY_DOTENV: Mapping[str, str] = MappingProxyType({})
+
+
+def _load_dotenv(p: Path) -> Mapping[str, str]:
+    # One stat answers "exists", "is a regular file" and "changed since last parse".
+    try:
+        st = os.stat(p)
+    except OSError:
+        return _EMPTY_DOTENV
+    if not stat.S_ISREG(st.st_mode):
+        return _EMPTY_DOTENV
+    mtime_ns = st.st_mtime_ns
+    cached = _DOTENV_CACHE.get(str(p))
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    values: Dict[str, str] = {}
+    try:
+        data = p.read_bytes()
+        for m in _DOTENV_RE.finditer(data):
+            # First assignment wins, matching the previous line-by-line lookup.
+            raw = m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+            values.setdefault(m.group(1).decode("ascii"), raw.decode("utf-8").strip())
+    except Exception:
+        return _EMPTY_DOTENV
+    view = MappingProxyType(values)
+    _DOTENV_CACHE[str(p)] = (mtime_ns, view)
+    return view
+
+
+# Per-class (field name, is nested section) tuples, built on first use.
+_PLAIN_FIELDS: Dict[type, Tuple[Tuple[str, bool], ...]] = {}
+
+
+def _to_plain(obj: Any) -> Dict[str, Any]:
+    # Settings sections only hold str/int/bool (or nested sections), so a field walk is
+    # enough; dataclasses.asdict would deepcopy every value.
+    cls = type(obj)
+    spec = _PLAIN_FIELDS.get(cls)
+    if spec is None:
+        spec = tuple((f.name, f.default_factory is not MISSING) for f in fields(cls))
+        _PLAIN_FIELDS[cls] = spec
+    return {
+        name: (_to_plain(getattr(obj, name)) if nested else getattr(obj, name))
+        for name, nested in spec
+    }
+
+
+# Per-class field names for _copy_dataclass, built on first use.
+_COPY_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _copy_dataclass(obj: Any) -> Any:
+    # Leaves are str/int/bool/Path (immutable), so only the section objects need rebuilding;
+    # far cheaper than copy.deepcopy and enough to keep the cached parse pristine.
+    cls = type(obj)
+    names = _COPY_FIELDS.get(cls)
+    if names is None:
+        names = tuple(f.name for f in fields(cls))
+        _COPY_FIELDS[cls] = names
+    kwargs = {}
+    for name in names:
+        value = getattr(obj, name)
+        kwargs[name] = _copy_dataclass(value) if hasattr(value, "__dataclass_fields__") else value
+    return cls(**kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _allowed_names(dc: type[Any], exclude: Tuple[str, ...] = ()) -> frozenset[str]:
+    return frozenset(f.name for f in fields(dc)).difference(exclude)
+
+
 def _filter_dataclass_kwargs(
     dc: type[Any], data: Dict[str, Any], *, exclude: Iterable[str] = ()
 ) -> Dict[str, Any]:
-    allowed = {f.name for f in fields(dc)}
-    excluded = set(exclude)
-    return {k: v for k, v in data.items() if k in allowed and k not in excluded}
+    allowed = _allowed_names(dc, tuple(exclude))
+    return {k: v for k, v in data.items() if k in allowed}
 
 
 STRUCTURED_SETTINGS_ROOTS = {
@@ -499,7 +679,49 @@ STRUCTURED_SETTINGS_ROOTS = {
 }
 
 
+_SECTION_TYPES: Dict[str, type] = {
+    "general": GeneralConfig,
+    "mail": MailConfig,
+    "calendar": CalendarConfig,
+    "summary": SummaryConfig,
+    "scheduler": SchedulerConfig,
+    "oauth": OAuthClientConfig,
+    "security": SecurityConfig,
+    "runtime": RuntimeFlags,
+    "routing": RoutingConfig,
+}
+
+
+def _leaf_paths(dc: type[Any], prefix: str) -> Iterable[str]:
+    for f in fields(dc):
+        path = f"{prefix}.{f.name}"
+        if f.default_factory is not MISSING:  # nested section
+            yield from _leaf_paths(f.default_factory, path)
+        else:
+            yield path
+
+
+def _path_setter(dotted: str) -> Callable[[Any, Any], None]:
+    parent, _, leaf = dotted.rpartition(".")
+    get_parent = operator.attrgetter(parent)
+
+    def setter(root_obj: Any, value: Any) -> None:
+        setattr(get_parent(root_obj), leaf, value)
+
+    return setter
+
+
+# Every leaf settings key -> (getter, setter) over a Settings instance, built once at import.
+_PATH_ACCESSORS: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any, Any], None]]] = {
+    path: (operator.attrgetter(path), _path_setter(path))
+    for ns, dc in _SECTION_TYPES.items()
+    for path in _leaf_paths(dc, ns)
+}
+
+
 def resolve_setting_key(key: str) -> str:
+    if key in _PATH_ACCESSORS:
+        return key
     raw = (key or "").strip()
     if not raw:
         raise ValueError("settings key is empty")
@@ -515,7 +737,47 @@ def resolve_setting_key(key: str) -> str:
     raise ValueError(f"Unknown settings namespace: {ns}")
 
 
+def _schema_default(dotted: str) -> Any:
+    # Walk dataclass fields (not instances) to find a leaf key's default value.
+    parts = dotted.split(".")
+    dc: Any = _SECTION_TYPES[parts[0]]
+    for i, part in enumerate(parts[1:], start=1):
+        match = next((f for f in fields(dc) if f.name == part), None)
+        if match is None:
+            raise AttributeError(part)
+        if match.default_factory is not MISSING:  # nested section
+            if i == len(parts) - 1:
+                raise ValueError(f"Not a leaf settings key: {dotted}")
+            dc = match.default_factory
+            continue
+        if i != len(parts) - 1:
+            raise AttributeError(parts[i + 1])
+        return match.default
+    raise ValueError(f"Not a leaf settings key: {dotted}")
+
+
+def _coerce_setting_value(cur: Any, value: Any) -> Any:
+    if isinstance(cur, bool):
+        if isinstance(value, str):
+            v = value.strip().lower()
+            if v in _TRUE:
+                return True
+            if v in _FALSE:
+                return False
+            raise ValueError(f"Invalid boolean value: {value}")
+        return bool(value)
+    if isinstance(cur, int):
+        try:
+            return int(value)
+        except Exception as exc:
+            raise ValueError(f"Invalid integer value: {value}") from exc
+    return str(value)
+
+
 def _get_path_value(root_obj: Any, dotted: str) -> Any:
+    acc = _PATH_ACCESSORS.get(dotted)
+    if acc is not None:
+        return acc[0](root_obj)
     obj = root_obj
     for part in dotted.split("."):
         obj = getattr(obj, part)
@@ -523,6 +785,10 @@ def _get_path_value(root_obj: Any, dotted: str) -> Any:
 
 
 def _set_path_value(root_obj: Any, dotted: str, value: Any) -> None:
+    acc = _PATH_ACCESSORS.get(dotted)
+    if acc is not None and not isinstance(root_obj, dict):
+        acc[1](root_obj, value)
+        return
     parts = dotted.split(".")
     obj = root_obj
     for part in parts[:-1]:
@@ -541,8 +807,7 @@ def _restrict_private_path(path: Path, *, is_dir: bool) -> None:
     if os.name == "nt":
         return
     try:
-        if not path.exists():
-            return
         os.chmod(path, 0o700 if is_dir else 0o600)
     except Exception:
+        # Missing paths included: nothing to restrict.
         pass
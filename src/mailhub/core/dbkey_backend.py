@@ -1,32 +1,74 @@
 from __future__ import annotations
 
 import base64
-import getpass
+import binascii
+import functools
 import os
 import secrets
 import shutil
+import stat
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Tuple
 
-try:
-    import keyring
-except Exception as _keyring_import_error:  # pragma: no cover - runtime env dependent
-    keyring = None
-    KEYRING_IMPORT_ERROR = _keyring_import_error
-else:  # pragma: no cover - runtime env dependent
-    KEYRING_IMPORT_ERROR = None
+from .config import expand_path
+
+# keyring (and the D-Bus/secretstorage stack under it) is imported on first keychain use only;
+# local/systemd setups never pay for it. `keyring` / `KEYRING_IMPORT_ERROR` resolve via __getattr__.
+_KEYRING: Any = None
+_KEYRING_IMPORT_ERROR: Exception | None = None
+_KEYRING_LOADED = False
+
+
+def _get_keyring() -> Any:
+    global _KEYRING, _KEYRING_IMPORT_ERROR, _KEYRING_LOADED
+    if not _KEYRING_LOADED:
+        try:
+            import keyring as mod
+        except Exception as exc:  # pragma: no cover - runtime env dependent
+            mod = None
+            _KEYRING_IMPORT_ERROR = exc
+        _KEYRING = mod
+        _KEYRING_LOADED = True
+    return _KEYRING
+
+
+def __getattr__(name: str) -> Any:
+    if name == "keyring":
+        return _get_keyring()
+    if name == "KEYRING_IMPORT_ERROR":
+        _get_keyring()
+        return _KEYRING_IMPORT_ERROR
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 BACKEND_KEYCHAIN = "keychain"
 BACKEND_SYSTEMD = "systemd"
 BACKEND_LOCAL = "local"
 BACKEND_ORDER = [BACKEND_KEYCHAIN, BACKEND_SYSTEMD, BACKEND_LOCAL]
+_BACKEND_SET = frozenset(BACKEND_ORDER)
 KEYCHAIN_SERVICE = "mailhub.dbkey"
 KEYCHAIN_ACCOUNT = "default"
 
+# Keychain/systemd probes fork helpers and talk D-Bus; reuse results (failures included) briefly.
+DETECT_TTL_SECONDS = 60.0
+_DETECT_CACHE: Dict[Tuple[Any, ...], Tuple[float, "BackendCheck"]] = {}
+# Decoded keys: ("file", path) -> ((mtime_ns, ino, size), key); ("keychain", account) -> (read_at, key).
+KEYCHAIN_CACHE_TTL_SECONDS = 300.0
+_DBKEY_CACHE: Dict[Tuple[str, str], Tuple[Any, bytes]] = {}
+# Round-trip probe outcomes: (name, *detect env key) -> (probed_at, ok, reason). Failures expire sooner since
+# they are often transient (locked keyring, daemon still starting).
+PROBE_OK_TTL_SECONDS = 30.0
+PROBE_FAIL_TTL_SECONDS = 5.0
+_PROBE_CACHE: Dict[Tuple[Any, ...], Tuple[float, bool, str]] = {}
+# keyring backends (notably SecretService) make no thread-safety promises.
+_KEYRING_LOCK = threading.Lock()
+
 
 @dataclass
 class BackendCheck:
@@ -41,31 +83,82 @@ class BackendCheck:
 
 
 def normalize_backend(raw: str) -> str:
+    if raw in _BACKEND_SET:
+        # Already canonical (the usual programmatic case): no strip/lower copies.
+        return raw
     v = (raw or "").strip().lower()
-    if v in (BACKEND_KEYCHAIN, BACKEND_SYSTEMD, BACKEND_LOCAL):
-        return v
-    return ""
+    return v if v in _BACKEND_SET else ""
 
 
 def default_local_dbkey_path(state_dir: Path, configured_path: str = "") -> Path:
     raw = (configured_path or "").strip()
     if not raw:
         return state_dir / "dbkey.enc"
-    p = Path(os.path.expandvars(raw)).expanduser()
+    p = expand_path(raw)
     if p.is_absolute():
         return p
     return state_dir / p
 
 
 def detect_backends(*, state_dir: Path, local_dbkey_path: Path) -> Dict[str, BackendCheck]:
-    out: Dict[str, BackendCheck] = {
-        BACKEND_KEYCHAIN: _detect_keychain(),
-        BACKEND_SYSTEMD: _detect_systemd(),
-        BACKEND_LOCAL: _detect_local(state_dir=state_dir, local_dbkey_path=local_dbkey_path),
-    }
+    # The probes are independent and block on subprocesses/D-Bus, so run them side by side.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        keychain = pool.submit(_detect_keychain)
+        systemd = pool.submit(_detect_systemd)
+        local = pool.submit(_detect_local, state_dir=state_dir, local_dbkey_path=local_dbkey_path)
+        out: Dict[str, BackendCheck] = {
+            BACKEND_KEYCHAIN: keychain.result(),
+            BACKEND_SYSTEMD: systemd.result(),
+            BACKEND_LOCAL: local.result(),
+        }
     return out
 
 
+def invalidate_detect_cache() -> None:
+    """Forget cached backend probes; write/delete call this so the next detect sees fresh state."""
+    _DETECT_CACHE.clear()
+    _PROBE_CACHE.clear()
+    expand_path.cache_clear()
+    _systemd_dbkey_file_cached.cache_clear()
+    _which_cached.cache_clear()
+
+
+def _detect_env_key() -> Tuple[Any, ...]:
+    return (
+        sys.platform,
+        os.environ.get("DBUS_SESSION_BUS_ADDRESS", ""),
+        os.environ.get("CREDENTIALS_DIRECTORY", ""),
+        os.environ.get("MAILHUB_DBKEY_FILE", ""),
+        os.geteuid() if hasattr(os, "geteuid") else -1,
+    )
+
+
+def _detect_ttl() -> float:
+    # MAILHUB_DBKEY_CACHE_TTL overrides the detection TTL in seconds; 0 disables reuse.
+    raw = (os.environ.get("MAILHUB_DBKEY_CACHE_TTL") or "").strip()
+    if not raw:
+        return DETECT_TTL_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DETECT_TTL_SECONDS
+
+
+def _ttl_cached(fn: Callable[[], BackendCheck]) -> Callable[[], BackendCheck]:
+    @functools.wraps(fn)
+    def wrapper() -> BackendCheck:
+        key = (fn.__name__,) + _detect_env_key()
+        now = time.monotonic()
+        hit = _DETECT_CACHE.get(key)
+        if hit and now - hit[0] < _detect_ttl():
+            return hit[1]
+        out = fn()
+        _DETECT_CACHE[key] = (now, out)
+        return out
+
+    return wrapper
+
+
 def pick_backend(checks: Dict[str, BackendCheck]) -> str:
     for name in BACKEND_ORDER:
         item = checks.get(name)
@@ -105,6 +198,8 @@ def write_dbkey(
 ) -> None:
     if len(key) != 32:
         raise RuntimeError("dbkey must be exactly 32 bytes")
+    invalidate_detect_cache()
+    _DBKEY_CACHE.clear()
     b = normalize_backend(backend)
     if b == BACKEND_KEYCHAIN:
         _write_keychain(key, keychain_account=keychain_account)
@@ -125,12 +220,17 @@ def delete_dbkey(
     local_dbkey_path: Path,
     keychain_account: str = KEYCHAIN_ACCOUNT,
 ) -> None:
+    invalidate_detect_cache()
+    _DBKEY_CACHE.clear()
     b = normalize_backend(backend)
     if b == BACKEND_KEYCHAIN:
+        keyring = _get_keyring()
         if keyring is None:
             return
         try:
-            keyring.delete_password(KEYCHAIN_SERVICE, keychain_account)
+            with _KEYRING_LOCK:
+                keyring.delete_password(KEYCHAIN_SERVICE, keychain_account)
+        # Third-party keyring backends raise their own (often D-Bus/OS) types, not only KeyringError.
         except Exception:
             pass
         return
@@ -138,27 +238,39 @@ def delete_dbkey(
         dbkey_file = (os.environ.get("MAILHUB_DBKEY_FILE") or "").strip()
         if dbkey_file:
             try:
-                Path(os.path.expandvars(dbkey_file)).expanduser().unlink(missing_ok=True)
-            except Exception:
+                expand_path(dbkey_file).unlink(missing_ok=True)
+            except OSError:
                 pass
         return
     if b == BACKEND_LOCAL:
         try:
             local_dbkey_path.unlink(missing_ok=True)
-        except Exception:
+        except OSError:
             pass
         return
 
 
+@_ttl_cached
 def _detect_keychain() -> BackendCheck:
-    if keyring is None:
+    if _get_keyring() is None:
         return BackendCheck(
             backend=BACKEND_KEYCHAIN,
             available=False,
-            reason=f"Python keyring module unavailable: {KEYRING_IMPORT_ERROR!r}",
+            reason=f"Python keyring module unavailable: {_KEYRING_IMPORT_ERROR!r}",
             suggestion="Install `keyring` or use local/systemd backend.",
             evidence={"keyring_import": False},
         )
+    # Steady state: a native keyring backend that passes the round-trip needs no platform
+    # prechecks (`security list-keychains`, gdbus ping); those only run to diagnose a failure.
+    native = _native_keyring_backend()
+    if native and _probe_keyring_roundtrip()[0]:
+        return BackendCheck(
+            backend=BACKEND_KEYCHAIN,
+            available=True,
+            reason="Keychain is reachable and keyring probe succeeded",
+            suggestion="",
+            evidence={"keyring_backend": native, "probe": "keyring_roundtrip"},
+        )
     if sys.platform == "darwin":
         return _detect_keychain_macos()
     if sys.platform.startswith("linux"):
@@ -210,7 +322,10 @@ def _detect_keychain_linux() -> BackendCheck:
             suggestion="Run in a desktop session with DBus/Secret Service, or use local backend.",
             evidence={"dbus_session": False},
         )
-    if not shutil.which("gdbus"):
+    path_env = os.environ.get("PATH")
+    gdbus = _which_cached("gdbus", path_env)
+    secret_tool = _which_cached("secret-tool", path_env)
+    if not gdbus:
         return BackendCheck(
             backend=BACKEND_KEYCHAIN,
             available=False,
@@ -219,9 +334,24 @@ def _detect_keychain_linux() -> BackendCheck:
             evidence={"dbus_session": True, "gdbus": False},
         )
 
+    # _detect_keychain already tried a Secret Service backend's round-trip; the result is
+    # reused from the probe cache here and the ping only explains why it failed.
+    probe_done = False
+    if _keyring_uses_secret_service():
+        probe_ok, probe_reason = _probe_keyring_roundtrip()
+        probe_done = True
+        if probe_ok:
+            return BackendCheck(
+                backend=BACKEND_KEYCHAIN,
+                available=True,
+                reason="Secret Service is reachable and keyring probe succeeded",
+                suggestion="",
+                evidence={"dbus_session": True, "ping_ok": True, "probe": "keyring_roundtrip"},
+            )
+
     ping_ok, _, ping_err = _run_cmd(
         [
-            "gdbus",
+            gdbus,
             "call",
             "--session",
             "--dest",
@@ -241,17 +371,18 @@ def _detect_keychain_linux() -> BackendCheck:
             evidence={"dbus_session": True, "ping_ok": False, "stderr": ping_err[:200]},
         )
 
-    probe_ok, probe_reason = _probe_keyring_roundtrip()
-    if probe_ok:
-        return BackendCheck(
-            backend=BACKEND_KEYCHAIN,
-            available=True,
-            reason="Secret Service is reachable and keyring probe succeeded",
-            suggestion="",
-            evidence={"dbus_session": True, "ping_ok": True, "probe": "keyring_roundtrip"},
-        )
+    if not probe_done:
+        probe_ok, probe_reason = _probe_keyring_roundtrip()
+        if probe_ok:
+            return BackendCheck(
+                backend=BACKEND_KEYCHAIN,
+                available=True,
+                reason="Secret Service is reachable and keyring probe succeeded",
+                suggestion="",
+                evidence={"dbus_session": True, "ping_ok": True, "probe": "keyring_roundtrip"},
+            )
 
-    if not shutil.which("secret-tool"):
+    if not secret_tool:
         return BackendCheck(
             backend=BACKEND_KEYCHAIN,
             available=False,
@@ -263,7 +394,7 @@ def _detect_keychain_linux() -> BackendCheck:
             evidence={"dbus_session": True, "ping_ok": True, "secret_tool": False},
         )
 
-    st_ok, st_reason = _probe_secret_tool_roundtrip()
+    st_ok, st_reason = _probe_secret_tool_roundtrip(secret_tool)
     if st_ok:
         return BackendCheck(
             backend=BACKEND_KEYCHAIN,
@@ -281,21 +412,58 @@ def _detect_keychain_linux() -> BackendCheck:
     )
 
 
+def _keyring_backend_module() -> str:
+    keyring = _get_keyring()
+    if keyring is None:
+        return ""
+    try:
+        backend = keyring.get_keyring()
+    except Exception:
+        return ""
+    return type(backend).__module__
+
+
+def _keyring_uses_secret_service() -> bool:
+    return "SecretService" in _keyring_backend_module()
+
+
+def _native_keyring_backend() -> str:
+    # Only the OS store counts; a file/plaintext keyring passing the probe says nothing about it.
+    module = _keyring_backend_module()
+    if sys.platform == "darwin":
+        return module if "macOS" in module else ""
+    if sys.platform.startswith("linux"):
+        if not (os.environ.get("DBUS_SESSION_BUS_ADDRESS") or "").strip():
+            return ""
+        return module if "SecretService" in module else ""
+    return ""
+
+
+@_ttl_cached
 def _detect_systemd() -> BackendCheck:
     path, source = _systemd_dbkey_file()
-    if path and path.exists() and path.is_file() and os.access(path, os.R_OK):
+    key: bytes | None = None
+    key_error: Exception | None = None
+    if path:
+        # Open-and-read is the readability check; missing, non-regular or unreadable files
+        # fall through to the "no injected credential" diagnosis below.
         try:
-            key = _load_key_material(path.read_bytes())
+            key = _read_key_file(path)
             if len(key) != 32:
                 raise ValueError("invalid key length")
-        except Exception as exc:
-            return BackendCheck(
-                backend=BACKEND_SYSTEMD,
-                available=False,
-                reason=f"systemd credential file unreadable/invalid: {exc}",
-                suggestion="Provide a valid 32-byte dbkey file via LoadCredential or MAILHUB_DBKEY_FILE.",
-                evidence={"source": source, "path": str(path)},
-            )
+        except OSError:
+            pass
+        except (RuntimeError, ValueError) as exc:
+            key_error = exc
+    if key_error is not None:
+        return BackendCheck(
+            backend=BACKEND_SYSTEMD,
+            available=False,
+            reason=f"systemd credential file unreadable/invalid: {key_error}",
+            suggestion="Provide a valid 32-byte dbkey file via LoadCredential or MAILHUB_DBKEY_FILE.",
+            evidence={"source": source, "path": str(path)},
+        )
+    if key is not None:
         return BackendCheck(
             backend=BACKEND_SYSTEMD,
             available=True,
@@ -304,7 +472,7 @@ def _detect_systemd() -> BackendCheck:
             evidence={"source": source, "path": str(path)},
         )
 
-    if shutil.which("systemctl"):
+    if _which_cached("systemctl", os.environ.get("PATH")):
         ok, out, err = _run_cmd(["systemctl", "is-system-running"])
         state = out.strip() if ok else err.strip()
         return BackendCheck(
@@ -332,7 +500,7 @@ def _detect_local(*, state_dir: Path, local_dbkey_path: Path) -> BackendCheck:
         _ensure_private_dir(state_dir)
         local_dbkey_path.parent.mkdir(parents=True, exist_ok=True)
         _ensure_private_dir(local_dbkey_path.parent)
-    except Exception as exc:
+    except OSError as exc:
         return BackendCheck(
             backend=BACKEND_LOCAL,
             available=False,
@@ -350,10 +518,17 @@ def _detect_local(*, state_dir: Path, local_dbkey_path: Path) -> BackendCheck:
 
 
 def _systemd_dbkey_file() -> Tuple[Path | None, str]:
-    env_file = (os.environ.get("MAILHUB_DBKEY_FILE") or "").strip()
+    return _systemd_dbkey_file_cached(
+        os.environ.get("MAILHUB_DBKEY_FILE") or "", os.environ.get("CREDENTIALS_DIRECTORY") or ""
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _systemd_dbkey_file_cached(env_file: str, cred_dir: str) -> Tuple[Path | None, str]:
+    env_file = env_file.strip()
     if env_file:
-        return Path(os.path.expandvars(env_file)).expanduser(), "MAILHUB_DBKEY_FILE"
-    cred_dir = (os.environ.get("CREDENTIALS_DIRECTORY") or "").strip()
+        return expand_path(env_file), "MAILHUB_DBKEY_FILE"
+    cred_dir = cred_dir.strip()
     if cred_dir:
         return (Path(cred_dir) / "dbkey"), "CREDENTIALS_DIRECTORY"
     return None, ""
@@ -365,9 +540,10 @@ def _read_systemd_key() -> bytes:
         raise RuntimeError(
             "systemd dbkey is not configured. Set CREDENTIALS_DIRECTORY with dbkey, or MAILHUB_DBKEY_FILE."
         )
-    if not path.exists() or not path.is_file() or not os.access(path, os.R_OK):
-        raise RuntimeError(f"systemd dbkey file is not readable: {path} ({source})")
-    return _load_key_material(path.read_bytes())
+    try:
+        return _read_key_file(path)
+    except OSError:
+        raise RuntimeError(f"systemd dbkey file is not readable: {path} ({source})") from None
 
 
 def _write_systemd_key(key: bytes) -> None:
@@ -377,92 +553,162 @@ def _write_systemd_key(key: bytes) -> None:
             "Cannot write systemd credential automatically without MAILHUB_DBKEY_FILE. "
             "Use systemd LoadCredential injection, or set MAILHUB_DBKEY_FILE to a writable file."
         )
-    p = Path(os.path.expandvars(dbkey_file)).expanduser()
+    p = expand_path(dbkey_file)
     p.parent.mkdir(parents=True, exist_ok=True)
     _ensure_private_dir(p.parent)
-    encoded = base64.urlsafe_b64encode(key).decode("ascii").rstrip("=")
-    p.write_text(f"{encoded}\n", encoding="utf-8")
-    _ensure_private_file(p)
+    _write_private_file(p, f"{_encode_key(key)}\n".encode("ascii"))
 
 
 def _read_local_key(path: Path, *, state_dir: Path) -> bytes:
-    if not path.exists():
-        raise RuntimeError(f"local dbkey file not found: {path}")
-    key = _load_key_material(path.read_bytes())
+    try:
+        key = _read_key_file(path)
+    except FileNotFoundError:
+        raise RuntimeError(f"local dbkey file not found: {path}") from None
     _ensure_private_dir(state_dir)
     _ensure_private_file(path)
     return key
 
 
+def _read_key_file(path: Path) -> bytes:
+    # One stat gives the file type and the cache signature; re-decode only when the file changes.
+    st = os.stat(path)
+    if not stat.S_ISREG(st.st_mode):
+        raise IsADirectoryError(f"not a regular file: {path}")
+    sig = (st.st_mtime_ns, st.st_ino, st.st_size)
+    cache_key = ("file", str(path))
+    hit = _DBKEY_CACHE.get(cache_key)
+    if hit and hit[0] == sig:
+        return hit[1]
+    if st.st_size > _KEY_MATERIAL_MAX_BYTES:
+        raise RuntimeError("dbkey payload too large")
+    with open(path, "rb") as fh:
+        key = _load_key_material(fh.read(_KEY_MATERIAL_MAX_BYTES + 1))
+    _DBKEY_CACHE[cache_key] = (sig, key)
+    return key
+
+
+_URLSAFE_TABLE = bytes.maketrans(b"+/", b"-_")
+
+
+def _encode_key(key: bytes) -> str:
+    # 32 bytes -> 44 base64 chars with one "=" pad; unpadded urlsafe is the first 43.
+    return binascii.b2a_base64(key, newline=False).translate(_URLSAFE_TABLE)[:43].decode("ascii")
+
+
 def _write_local_key(path: Path, key: bytes, *, state_dir: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     _ensure_private_dir(state_dir)
     _ensure_private_dir(path.parent)
-    encoded = base64.urlsafe_b64encode(key).decode("ascii").rstrip("=")
-    path.write_text(f"{encoded}\n", encoding="utf-8")
-    _ensure_private_file(path)
+    _write_private_file(path, f"{_encode_key(key)}\n".encode("ascii"))
 
 
 def _read_keychain(*, keychain_account: str) -> bytes:
+    keyring = _get_keyring()
     if keyring is None:
         raise RuntimeError("keyring module is unavailable")
-    raw = keyring.get_password(KEYCHAIN_SERVICE, keychain_account)
+    # No mtime signal for keychain items, so a TTL bounds how long an external change goes unseen.
+    cache_key = ("keychain", keychain_account)
+    hit = _DBKEY_CACHE.get(cache_key)
+    now = time.monotonic()
+    if hit and now - hit[0] < KEYCHAIN_CACHE_TTL_SECONDS:
+        return hit[1]
+    with _KEYRING_LOCK:
+        raw = keyring.get_password(KEYCHAIN_SERVICE, keychain_account)
     if not raw:
         raise RuntimeError("dbkey not found in keychain")
-    return _load_key_material(raw.encode("utf-8"))
+    key = _load_key_material(raw.encode("utf-8"))
+    _DBKEY_CACHE[cache_key] = (now, key)
+    return key
 
 
 def _write_keychain(key: bytes, *, keychain_account: str) -> None:
+    keyring = _get_keyring()
     if keyring is None:
         raise RuntimeError("keyring module is unavailable")
-    encoded = base64.urlsafe_b64encode(key).decode("ascii").rstrip("=")
-    keyring.set_password(KEYCHAIN_SERVICE, keychain_account, encoded)
+    encoded = _encode_key(key)
+    with _KEYRING_LOCK:
+        keyring.set_password(KEYCHAIN_SERVICE, keychain_account, encoded)
+    # Write-through so the next read skips the keychain round-trip.
+    _DBKEY_CACHE[("keychain", keychain_account)] = (time.monotonic(), bytes(key))
+
+
+def _cached_probe(name: str, probe: Callable[[], Tuple[bool, str]]) -> Tuple[bool, str]:
+    key = (name,) + _detect_env_key()
+    now = time.monotonic()
+    hit = _PROBE_CACHE.get(key)
+    if hit:
+        probed_at, ok, reason = hit
+        if now - probed_at < (PROBE_OK_TTL_SECONDS if ok else PROBE_FAIL_TTL_SECONDS):
+            return ok, reason
+    ok, reason = probe()
+    _PROBE_CACHE[key] = (now, ok, reason)
+    return ok, reason
 
 
 def _probe_keyring_roundtrip() -> Tuple[bool, str]:
+    return _cached_probe("keyring", _probe_keyring_roundtrip_uncached)
+
+
+def _probe_keyring_roundtrip_uncached() -> Tuple[bool, str]:
+    import getpass
+
+    keyring = _get_keyring()
     if keyring is None:
         return False, "keyring module is unavailable"
     probe_account = f"probe.{getpass.getuser()}.{os.getpid()}"
     probe_value = base64.urlsafe_b64encode(secrets.token_bytes(18)).decode("ascii")
-    try:
-        keyring.set_password(KEYCHAIN_SERVICE, probe_account, probe_value)
-        got = keyring.get_password(KEYCHAIN_SERVICE, probe_account)
-        if got != probe_value:
-            return False, "keyring read value mismatch"
-        return True, ""
-    except Exception as exc:
-        return False, str(exc)
-    finally:
+    with _KEYRING_LOCK:
         try:
-            keyring.delete_password(KEYCHAIN_SERVICE, probe_account)
-        except Exception:
-            pass
+            keyring.set_password(KEYCHAIN_SERVICE, probe_account, probe_value)
+            got = keyring.get_password(KEYCHAIN_SERVICE, probe_account)
+            if got != probe_value:
+                return False, "keyring read value mismatch"
+            return True, ""
+        except Exception as exc:
+            return False, str(exc)
+        finally:
+            try:
+                keyring.delete_password(KEYCHAIN_SERVICE, probe_account)
+            except Exception:
+                pass
+
 
+# store, lookup and clear in one spawn; the clear runs even if lookup fails. $1 is the probe name.
+_SECRET_TOOL_PROBE_SCRIPT = (
+    '"$0" store --label=mailhub-dbkey-probe service mailhub probe "$1" || exit 1; '
+    '"$0" lookup service mailhub probe "$1"; rc=$?; '
+    '"$0" clear service mailhub probe "$1"; exit $rc'
+)
 
-def _probe_secret_tool_roundtrip() -> Tuple[bool, str]:
-    if not shutil.which("secret-tool"):
+
+def _probe_secret_tool_roundtrip(secret_tool: str = "") -> Tuple[bool, str]:
+    secret_tool = secret_tool or _which_cached("secret-tool", os.environ.get("PATH"))
+    if not secret_tool:
         return False, "secret-tool not found"
+    return _cached_probe(f"secret-tool:{secret_tool}", lambda: _secret_tool_roundtrip(secret_tool))
+
+
+def _secret_tool_roundtrip(secret_tool: str) -> Tuple[bool, str]:
     probe_name = f"mailhub-probe-{os.getpid()}-{secrets.token_hex(4)}"
     probe_value = base64.urlsafe_b64encode(secrets.token_bytes(12)).decode("ascii")
-    ok, _, err = _run_cmd(
-        ["secret-tool", "store", "--label=mailhub-dbkey-probe", "service", "mailhub", "probe", probe_name],
+    ok, out, err = _run_cmd(
+        ["sh", "-c", _SECRET_TOOL_PROBE_SCRIPT, secret_tool, probe_name],
         input_text=probe_value,
     )
     if not ok:
         return False, err[:200]
-    try:
-        ok2, out2, err2 = _run_cmd(["secret-tool", "lookup", "service", "mailhub", "probe", probe_name])
-        if not ok2:
-            return False, err2[:200]
-        got = out2.strip()
-        if got != probe_value:
-            return False, "secret-tool read value mismatch"
-        return True, ""
-    finally:
-        _run_cmd(["secret-tool", "clear", "service", "mailhub", "probe", probe_name])
+    if out.strip() != probe_value:
+        return False, "secret-tool read value mismatch"
+    return True, ""
+
+
+# Longest accepted form is "base64:" + 44 chars (or 64 hex chars) plus surrounding whitespace.
+_KEY_MATERIAL_MAX_BYTES = 128
 
 
 def _load_key_material(raw_bytes: bytes) -> bytes:
+    if len(raw_bytes) > _KEY_MATERIAL_MAX_BYTES:
+        raise RuntimeError("dbkey payload too large")
     raw = raw_bytes.strip()
     if not raw:
         raise RuntimeError("dbkey payload is empty")
@@ -471,59 +717,146 @@ def _load_key_material(raw_bytes: bytes) -> bytes:
     text = raw.decode("utf-8", errors="ignore").strip()
     if text.startswith("base64:"):
         text = text[7:].strip()
-    if len(text) == 64 and all(ch in "0123456789abcdefABCDEF" for ch in text):
-        out = bytes.fromhex(text)
+    # Pick the one decoder the length calls for; anything unusual takes the lenient scan below.
+    n = len(text)
+    if n == 64:
+        # fromhex validates and decodes in one C pass; it tolerates spaces, hence the length check.
+        try:
+            out = bytes.fromhex(text)
+        except ValueError:
+            out = b""
         if len(out) == 32:
             return out
-    for candidate in (text, text + "=" * (-len(text) % 4)):
+    if n in (43, 44):
         try:
-            out = base64.urlsafe_b64decode(candidate.encode("ascii"))
+            # urlsafe decoding also accepts the standard +/ alphabet.
+            out = base64.urlsafe_b64decode(text + "=" * (-n % 4))
             if len(out) == 32:
                 return out
-        except Exception:
+        except (binascii.Error, ValueError):
             pass
-        try:
-            out = base64.b64decode(candidate.encode("ascii"))
+    return _scan_key_material(text)
+
+
+def _scan_key_material(text: str) -> bytes:
+    # Padding is normalised once: an unpadded attempt can only succeed when it already is padded.
+    try:
+        data = (text + "=" * (-len(text) % 4)).encode("ascii")
+    except UnicodeEncodeError:
+        data = b""
+    if data:
+        # urlsafe decoding maps -_ and keeps +/, so the standard alphabet only gives a different
+        # answer (by dropping -_) when those characters are present.
+        decoders: Tuple[Callable[[bytes], bytes], ...] = (base64.urlsafe_b64decode,)
+        if len(data.translate(None, b"-_")) != len(data):
+            decoders += (base64.b64decode,)
+        for decode in decoders:
+            try:
+                out = decode(data)
+            except ValueError:
+                continue
             if len(out) == 32:
                 return out
-        except Exception:
-            pass
     if len(text.encode("utf-8")) == 32:
         return text.encode("utf-8")
     raise RuntimeError("dbkey must decode to exactly 32 bytes")
 
 
+@functools.lru_cache(maxsize=16)
+def _which_cached(cmd: str, path_env: str | None) -> str:
+    # PATH is part of the key so a changed environment triggers a fresh lookup.
+    return shutil.which(cmd, path=path_env) or ""
+
+
 def _run_cmd(args: list[str], input_text: str = "") -> Tuple[bool, str, str]:
+    # An absolute executable and close_fds=False let CPython use posix_spawn instead of fork+exec
+    # (Python-opened fds are non-inheritable by default, so nothing extra leaks to the child).
+    exe = _which_cached(args[0], os.environ.get("PATH")) or args[0]
     try:
         cp = subprocess.run(
-            args,
+            [exe, *args[1:]],
             input=input_text if input_text else None,
             text=True,
             capture_output=True,
+            close_fds=False,
             check=False,
         )
         return cp.returncode == 0, (cp.stdout or ""), (cp.stderr or "")
-    except Exception as exc:
+    except (OSError, ValueError) as exc:
         return False, "", str(exc)
 
 
-def _ensure_private_dir(path: Path) -> None:
+# The private umask is process-wide and sticky, so it only needs setting on first use.
+_UMASK_SET = False
+
+
+def _ensure_private_mode(path: Path, mode: int) -> None:
+    global _UMASK_SET
     if os.name == "nt":
         return
-    os.umask(0o077)
+    if not _UMASK_SET:
+        os.umask(0o077)
+        _UMASK_SET = True
     try:
-        if path.exists():
-            os.chmod(path, 0o700)
-    except Exception:
+        if stat.S_IMODE(os.stat(path).st_mode) != mode:
+            os.chmod(path, mode)
+    except OSError:
         pass
 
 
-def _ensure_private_file(path: Path) -> None:
+_PRIVATE_CREATE_FLAGS = (
+    os.O_WRONLY
+    | os.O_CREAT
+    | os.O_EXCL
+    | getattr(os, "O_NOFOLLOW", 0)
+    | getattr(os, "O_CLOEXEC", 0)
+    | getattr(os, "O_BINARY", 0)
+)
+
+
+def _write_private_file(path: Path, data: bytes) -> None:
+    # Created 0600 from the start and renamed into place, so readers never see a partial
+    # or briefly world-readable key and no follow-up chmod is needed. Both the file and the
+    # directory entry are fsynced: an empty or truncated dbkey would lock the DB for good.
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    fd = os.open(tmp, _PRIVATE_CREATE_FLAGS, 0o600)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(path: Path) -> None:
+    # Persists the rename; directories cannot be opened for fsync on Windows.
     if os.name == "nt":
         return
-    os.umask(0o077)
     try:
-        if path.exists():
-            os.chmod(path, 0o600)
-    except Exception:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
         pass
+    finally:
+        os.close(fd)
+
+
+def _ensure_private_dir(path: Path) -> None:
+    _ensure_private_mode(path, 0o700)
+
+
+def _ensure_private_file(path: Path) -> None:
+    _ensure_private_mode(path, 0o600)
@@ -1,31 +1,29 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 import platform
 import shlex
 import shutil
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 from zoneinfo import ZoneInfo
 
 from .. import __version__
 from .accounts import list_accounts
-from .config import Settings
+from .config import Settings, expand_path
 from .dbkey_backend import BACKEND_LOCAL, default_local_dbkey_path, detect_backends
 from .security import SecretStore
 from .store import DB
 from ..shared.time import utc_now_iso
 from ..shared.time import parse_since
-from ..flows.ingest import inbox_poll
-from ..flows.triage import triage_day, triage_suggest
-from ..flows.reply import reply_auto
-from ..flows.billing import billing_analyze, billing_detect, billing_month
-from ..flows.summary import daily_summary
-from ..flows.calendar import calendar_event
 from .logging import get_logger, log_event
 
 
@@ -70,10 +68,11 @@ def config_checklist(s: Settings) -> Dict[str, Any]:
     accounts = list_accounts(db, hide_email_when_alias=True)
     google_env = bool(os.environ.get("GOOGLE_OAUTH_CLIENT_ID", "").strip())
     ms_env = bool(os.environ.get("MS_OAUTH_CLIENT_ID", "").strip())
-    models_path = Path(os.path.expandvars(s.effective_standalone_models_path())).expanduser()
+    models_path = expand_path(s.effective_standalone_models_path())
     models = s.load_standalone_models()
     runner = models.get("runner", {}) if isinstance(models, dict) else {}
     runner_cmd_set = bool(str(runner.get("command") or "").strip()) if isinstance(runner, dict) else False
+    oauth = s.effective_oauth_dict()
     return {
         "reviewed": s.runtime.config_reviewed,
         "confirmed": s.runtime.config_confirmed,
@@ -96,9 +95,9 @@ def config_checklist(s: Settings) -> Dict[str, Any]:
                 "runtime": _runtime_mode_info(s),
             },
             "oauth_defaults": {
-                "google_client_id_set": bool(s.effective_google_client_id()),
+                "google_client_id_set": bool(oauth["GOOGLE_OAUTH_CLIENT_ID"]),
                 "google_client_id_source": "env" if google_env else ("settings" if s.oauth.google_client_id else ""),
-                "ms_client_id_set": bool(s.effective_ms_client_id()),
+                "ms_client_id_set": bool(oauth["MS_OAUTH_CLIENT_ID"]),
                 "ms_client_id_source": "env" if ms_env else ("settings" if s.oauth.ms_client_id else ""),
             },
             "security": {
@@ -111,9 +110,30 @@ def config_checklist(s: Settings) -> Dict[str, Any]:
     }
 
 
+def _confirmed_marker_fresh(state_dir: Path) -> bool:
+    # `.confirmed` only counts while it is at least as new as settings.json, so any later
+    # settings write (including un-confirming) forces one real check.
+    try:
+        marker_mtime = (state_dir / ".confirmed").stat().st_mtime_ns
+        settings_mtime = (state_dir / "settings.json").stat().st_mtime_ns
+    except OSError:
+        return False
+    return marker_mtime >= settings_mtime
+
+
+def _touch_confirmed_marker(state_dir: Path) -> None:
+    try:
+        (state_dir / ".confirmed").touch(mode=0o600)
+    except OSError:
+        pass
+
+
 def ensure_config_confirmed(confirm_config: bool = False) -> Dict[str, Any] | None:
+    if _confirmed_marker_fresh(Settings.default_state_dir()):
+        return None
     s = Settings.load()
     if s.runtime.config_confirmed:
+        _touch_confirmed_marker(s.state_dir)
         return None
     if confirm_config:
         if not s.runtime.config_reviewed:
@@ -126,6 +146,7 @@ def ensure_config_confirmed(confirm_config: bool = False) -> Dict[str, Any] | No
         s.runtime.config_confirmed = True
         s.runtime.config_confirmed_at = utc_now_iso()
         s.save()
+        _touch_confirmed_marker(s.state_dir)
         return {"ok": True, "config_confirmed": True, "confirmed_at": s.runtime.config_confirmed_at}
     return {
         "ok": False,
@@ -148,8 +169,9 @@ def mark_config_reviewed() -> Dict[str, Any]:
     }
 
 
-def doctor_report(*, full: bool = False) -> Dict[str, Any]:
-    s = Settings.load()
+def doctor_report(*, full: bool = False, settings: Settings | None = None) -> Dict[str, Any]:
+    # Callers that already hold the settings (run_jobs) pass them to skip another load().
+    s = settings or Settings.load()
     checks: List[Dict[str, Any]] = []
     warnings: List[str] = []
     errors: List[str] = []
@@ -370,15 +392,34 @@ def doctor_report(*, full: bool = False) -> Dict[str, Any]:
     return report
 
 
+def doctor_precheck(s: Settings, db: DB) -> Tuple[bool, int]:
+    """
+    Cheap gate for run_jobs: the checks whose failure makes `doctor_report()["ok"]` false
+    (state dir, DB open/init with the dbkey, provider and account listing), plus the provider count.
+    """
+    try:
+        s.ensure_dirs()
+        db.init()
+        providers = db.list_providers()
+        list_accounts(db, hide_email_when_alias=True)
+    except Exception:
+        return False, 0
+    return True, len(providers)
+
+
 def _standalone_models_health(s: Settings) -> Dict[str, Any]:
     mode = s.effective_mode()
-    models_path = Path(os.path.expandvars(s.effective_standalone_models_path())).expanduser()
-    openclaw_json_path = Path(os.path.expandvars(s.effective_openclaw_json_path())).expanduser()
+    models_path = expand_path(s.effective_standalone_models_path())
+    openclaw_json_path = expand_path(s.effective_openclaw_json_path())
+    try:
+        models_mtime_ns = os.stat(models_path).st_mtime_ns
+    except OSError:
+        models_mtime_ns = None
     out: Dict[str, Any] = {
         "ok": True,
         "mode": mode,
         "models_path": str(models_path),
-        "models_exists": models_path.exists(),
+        "models_exists": models_mtime_ns is not None,
         "models_json_valid": False,
         "runner_command": "",
         "runner_command_resolved": "",
@@ -393,16 +434,15 @@ def _standalone_models_health(s: Settings) -> Dict[str, Any]:
         out["message"] = "mode is not standalone; check skipped"
         return out
 
-    if not models_path.exists():
+    if models_mtime_ns is None:
         out["ok"] = False
         out["message"] = "standalone models file missing"
         return out
 
-    try:
-        raw = json.loads(models_path.read_text(encoding="utf-8"))
-    except Exception as exc:
+    raw, parse_error = _load_models_cached(str(models_path), models_mtime_ns)
+    if parse_error:
         out["ok"] = False
-        out["message"] = f"standalone models JSON parse failed: {exc}"
+        out["message"] = f"standalone models JSON parse failed: {parse_error}"
         return out
     if not isinstance(raw, dict):
         out["ok"] = False
@@ -429,9 +469,7 @@ def _standalone_models_health(s: Settings) -> Dict[str, Any]:
         if p.exists():
             resolved = str(p)
     else:
-        found = shutil.which(argv0)
-        if found:
-            resolved = found
+        resolved = _which_cached(argv0, os.environ.get("PATH"))
     out["runner_command_resolved"] = resolved
     out["runner_command_available"] = bool(resolved)
     if not resolved:
@@ -458,6 +496,21 @@ def _standalone_models_health(s: Settings) -> Dict[str, Any]:
     return out
 
 
+@functools.lru_cache(maxsize=8)
+def _load_models_cached(path: str, mtime_ns: int) -> Tuple[Any, str]:
+    # (parsed JSON, parse error); mtime_ns only keys the cache so edits are re-read.
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")), ""
+    except Exception as exc:
+        return None, str(exc) or type(exc).__name__
+
+
+@functools.lru_cache(maxsize=16)
+def _which_cached(cmd: str, path_env: str | None) -> str:
+    # PATH is part of the key so a changed environment triggers a fresh lookup.
+    return shutil.which(cmd, path=path_env) or ""
+
+
 def _fs_privacy_health(s: Settings) -> Dict[str, Any]:
     out: Dict[str, Any] = {
         "ok": True,
@@ -478,15 +531,14 @@ def _fs_privacy_health(s: Settings) -> Dict[str, Any]:
     ]
     strict_failures: List[str] = []
     for p, expect, name in targets:
-        exists = p.exists()
-        mode = None
-        ok = True
-        if exists:
-            try:
-                mode = p.stat().st_mode & 0o777
-                ok = (mode & 0o077) == 0 and (mode & 0o700) <= expect
-            except Exception:
-                ok = False
+        # One stat answers both "exists" and "mode".
+        try:
+            mode = os.stat(p).st_mode & 0o777
+        except OSError:
+            exists, mode, ok = False, None, True
+        else:
+            exists = True
+            ok = (mode & 0o077) == 0 and (mode & 0o700) <= expect
         item = {"name": name, "path": str(p), "exists": exists, "mode": (oct(mode) if mode is not None else "")}
         item["ok"] = ok
         out["checks"].append(item)
@@ -500,6 +552,15 @@ def _fs_privacy_health(s: Settings) -> Dict[str, Any]:
 
 
 def run_jobs(since: str | None = None) -> Dict[str, Any]:
+    # Flow modules are only needed here; keeping them out of module scope lets
+    # doctor/config/confirmation checks import this module without the flow stack.
+    from ..flows.ingest import inbox_poll
+    from ..flows.triage import triage_day, triage_suggest
+    from ..flows.reply import reply_auto
+    from ..flows.billing import billing_analyze, billing_detect, billing_month
+    from ..flows.summary import daily_summary
+    from ..flows.calendar import calendar_event
+
     s = Settings.load()
     db = DB(s.db_path)
     db.init()
@@ -511,18 +572,22 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
         since=since or "",
     )
 
-    doctor = doctor_report()
-    if not doctor["ok"]:
-        log_event(
-            logger,
-            "jobs_run_doctor_failed",
-            level="warning",
-            warnings=len(doctor.get("warnings") or []),
-            errors=len(doctor.get("errors") or []),
-        )
-        return {"ok": False, "reason": "doctor_failed", "runtime": runtime, "doctor": doctor}
+    precheck_ok, provider_total = doctor_precheck(s, db)
+    if not precheck_ok:
+        # Only build the full report (backend detection, schedules, fs modes) when it has to explain a failure.
+        doctor = doctor_report(settings=s)
+        if not doctor["ok"]:
+            log_event(
+                logger,
+                "jobs_run_doctor_failed",
+                level="warning",
+                warnings=len(doctor.get("warnings") or []),
+                errors=len(doctor.get("errors") or []),
+            )
+            return {"ok": False, "reason": "doctor_failed", "runtime": runtime, "doctor": doctor}
+        provider_total = doctor["providers"]["total"]
 
-    if doctor["providers"]["total"] == 0:
+    if provider_total == 0:
         log_event(logger, "jobs_run_no_provider_bound", level="warning")
         return {
             "ok": False,
@@ -595,12 +660,32 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
     out["schedule"]["billing_due_slots"] = due_billing
 
     if due_digest:
-        out["steps"]["digest"] = triage_day("today")
+        # Same day, same rows: reuse this run's triage instead of classifying everything again.
+        out["steps"]["digest"] = out["steps"]["triage_today"]
         log_event(logger, "jobs_digest_triggered", slots=due_digest)
-        for slot in due_digest:
-            db.kv_set(f"jobs.digest.{slot}", now_local.isoformat(), utc_now_iso())
+        # Recorded right away: the digest has fired even if a later scheduled step fails.
+        db.kv_set_many((f"jobs.digest.{slot}", now_local.isoformat(), utc_now_iso()) for slot in due_digest)
 
-    if due_billing and s.mail.billing.analysis_mode == "on":
+    reminder_due_slots = _due_interval_slots(
+        db=db,
+        key_prefix="jobs.calendar_reminder",
+        now_local=now_local,
+        weekdays_csv=s.calendar.reminder.weekdays,
+        times_csv=s.calendar.reminder.trigger_times_local,
+        interval_seconds=interval_seconds,
+    )
+    summary_due_slots = _due_interval_slots(
+        db=db,
+        key_prefix="jobs.summary",
+        now_local=now_local,
+        weekdays_csv=s.summary.weekdays,
+        times_csv=s.summary.trigger_times_local,
+        interval_seconds=interval_seconds,
+    )
+    out["schedule"]["calendar_reminder_due_slots"] = reminder_due_slots
+    out["schedule"]["summary_due_slots"] = summary_due_slots
+
+    def _billing_step() -> Dict[str, Any]:
         det = billing_detect(since="45d")
         analyzed = []
         for item in det.get("detected", []):
@@ -612,47 +697,46 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
             except Exception as exc:
                 analyzed.append({"statement_id": sid, "error": str(exc)})
         month = now_local.strftime("%Y-%m")
-        out["steps"]["billing"] = {
+        return {
             "detect": det,
             "analyzed": analyzed,
             "month": billing_month(month),
         }
+
+    # Billing (mail DB + agent) and the calendar fetches (provider HTTP) do not feed each other,
+    # so they overlap; the mail steps above stay sequential because each re-triages the same rows.
+    # Slot bookkeeping happens below on this thread once all of them have finished.
+    scheduled: Dict[str, Callable[[], Any]] = {}
+    if due_billing and s.mail.billing.analysis_mode == "on":
+        scheduled["billing"] = _billing_step
+    if s.calendar.reminder.enabled and s.calendar.reminder.in_jobs_run and reminder_due_slots:
+        scheduled["calendar_reminder"] = functools.partial(
+            calendar_event, event="remind", datetime_range_raw=s.calendar.reminder.range
+        )
+    if s.summary.enabled and s.summary.in_jobs_run and summary_due_slots:
+        scheduled["summary_calendar"] = functools.partial(
+            calendar_event, event="summary", datetime_range_raw=s.summary.range
+        )
+    done, failed = _run_scheduled_steps(scheduled)
+    # Slots of the steps that ran are recorded together in one transaction.
+    slot_marks: List[Tuple[str, str, str]] = []
+
+    if "billing" in done:
+        out["steps"]["billing"] = done["billing"]
+        det = done["billing"]["detect"]
         log_event(
             logger,
             "jobs_billing_triggered",
             slots=due_billing,
             detected_count=len(det.get("detected") or []),
-            analyzed_count=len(analyzed),
+            analyzed_count=len(done["billing"]["analyzed"]),
         )
-        for slot in due_billing:
-            db.kv_set(f"jobs.billing.{slot}", now_local.isoformat(), utc_now_iso())
-
-    reminder_due_slots = _due_interval_slots(
-        db=db,
-        key_prefix="jobs.calendar_reminder",
-        now_local=now_local,
-        weekdays_csv=s.calendar.reminder.weekdays,
-        times_csv=s.calendar.reminder.trigger_times_local,
-        interval_seconds=interval_seconds,
-    )
-    summary_due_slots = _due_interval_slots(
-        db=db,
-        key_prefix="jobs.summary",
-        now_local=now_local,
-        weekdays_csv=s.summary.weekdays,
-        times_csv=s.summary.trigger_times_local,
-        interval_seconds=interval_seconds,
-    )
-    out["schedule"]["calendar_reminder_due_slots"] = reminder_due_slots
-    out["schedule"]["summary_due_slots"] = summary_due_slots
+        slot_marks.extend((f"jobs.billing.{slot}", now_local.isoformat(), utc_now_iso()) for slot in due_billing)
 
     if s.calendar.reminder.enabled:
         if s.calendar.reminder.in_jobs_run:
-            if reminder_due_slots:
-                out["steps"]["calendar_reminder"] = calendar_event(
-                    event="remind",
-                    datetime_range_raw=s.calendar.reminder.range,
-                )
+            if "calendar_reminder" in done:
+                out["steps"]["calendar_reminder"] = done["calendar_reminder"]
                 reminder = out["steps"]["calendar_reminder"] or {}
                 log_event(
                     logger,
@@ -660,8 +744,10 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
                     slots=reminder_due_slots,
                     event_count=int(reminder.get("count", 0)),
                 )
-                for slot in reminder_due_slots:
-                    db.kv_set(f"jobs.calendar_reminder.{slot}", now_local.isoformat(), utc_now_iso())
+                slot_marks.extend(
+                    (f"jobs.calendar_reminder.{slot}", now_local.isoformat(), utc_now_iso())
+                    for slot in reminder_due_slots
+                )
         else:
             out["schedule"]["calendar_reminder_external_cron_hint"] = (
                 "Calendar reminder is enabled but excluded from mail run flow. "
@@ -670,13 +756,10 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
 
     if s.summary.enabled:
         if s.summary.in_jobs_run:
-            if summary_due_slots:
+            if "summary_calendar" in done:
                 out["steps"]["scheduled_summary"] = {
-                    "mail_daily": daily_summary("today"),
-                    "calendar": calendar_event(
-                        event="summary",
-                        datetime_range_raw=s.summary.range,
-                    ),
+                    "mail_daily": out["steps"]["daily_summary"],
+                    "calendar": done["summary_calendar"],
                 }
                 sched = out["steps"]["scheduled_summary"] or {}
                 cal = sched.get("calendar") or {}
@@ -686,8 +769,9 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
                     slots=summary_due_slots,
                     calendar_event_count=int(cal.get("count", 0) if isinstance(cal, dict) else 0),
                 )
-                for slot in summary_due_slots:
-                    db.kv_set(f"jobs.summary.{slot}", now_local.isoformat(), utc_now_iso())
+                slot_marks.extend(
+                    (f"jobs.summary.{slot}", now_local.isoformat(), utc_now_iso()) for slot in summary_due_slots
+                )
         else:
             out["schedule"]["summary_external_cron_hint"] = (
                 "Summary is enabled but excluded from mail run flow. "
@@ -696,31 +780,44 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
                 f"mailhub calendar --event summary --datetime-range \"{s.summary.range}\""
             )
 
-    # Persist latest snapshots for openclaw/standalone bridge retrieval.
+    db.kv_set_many(slot_marks)
+    if failed:
+        # Successful steps are recorded above so they do not fire again; then surface the failure.
+        for name, exc in failed.items():
+            log_event(logger, "jobs_scheduled_step_failed", level="warning", step=name, error=str(exc))
+        raise next(iter(failed.values()))
+
+    # Persist latest snapshots for openclaw/standalone bridge retrieval. Rows are serialised here
+    # (the caller may mutate `out` afterwards) and written off the return path in one transaction.
     try:
-        cache_latest_result(
-            "mail",
-            {
-                "since": effective_since,
-                "poll": out["steps"].get("poll"),
-                "triage_today": out["steps"].get("triage_today"),
-                "daily_summary": out["steps"].get("daily_summary"),
-                "alerts": out["steps"].get("alerts"),
-                "auto_reply": out["steps"].get("auto_reply"),
-            },
-        )
+        snapshots: List[Tuple[str, Any]] = [
+            (
+                "mail",
+                {
+                    "since": effective_since,
+                    "poll": out["steps"].get("poll"),
+                    "triage_today": out["steps"].get("triage_today"),
+                    "daily_summary": out["steps"].get("daily_summary"),
+                    "alerts": out["steps"].get("alerts"),
+                    "auto_reply": out["steps"].get("auto_reply"),
+                },
+            )
+        ]
         if "calendar_reminder" in out["steps"]:
-            cache_latest_result("calendar", out["steps"]["calendar_reminder"])
+            snapshots.append(("calendar", out["steps"]["calendar_reminder"]))
         if "scheduled_summary" in out["steps"]:
-            cache_latest_result("summary", out["steps"]["scheduled_summary"])
+            snapshots.append(("summary", out["steps"]["scheduled_summary"]))
         else:
-            cache_latest_result(
-                "summary",
-                {
-                    "mail_daily": out["steps"].get("daily_summary"),
-                    "calendar": None,
-                },
+            snapshots.append(
+                (
+                    "summary",
+                    {
+                        "mail_daily": out["steps"].get("daily_summary"),
+                        "calendar": None,
+                    },
+                )
             )
+        _submit_result_write(s.db_path, [_cached_result_row(sec, payload)[1] for sec, payload in snapshots])
     except Exception:
         pass
 
@@ -733,21 +830,85 @@ def run_jobs(since: str | None = None) -> Dict[str, Any]:
     return out
 
 
-def cache_latest_result(section: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    s = Settings.load()
-    db = DB(s.db_path)
+def _run_scheduled_steps(
+    steps: Dict[str, Callable[[], Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Run the steps and return (results, failures) keyed by step name. A failing step does not
+    discard the others' results: those already had side effects (e.g. reminders sent).
+    MAILHUB_JOBS_PARALLEL=0 runs them one after another and stops at the first failure.
+    """
+    done: Dict[str, Any] = {}
+    failed: Dict[str, Exception] = {}
+    if len(steps) <= 1 or os.environ.get("MAILHUB_JOBS_PARALLEL", "").strip() == "0":
+        for name, fn in steps.items():
+            try:
+                done[name] = fn()
+            except Exception as exc:
+                failed[name] = exc
+                break
+        return done, failed
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = {name: pool.submit(fn) for name, fn in steps.items()}
+        for name, fut in futures.items():
+            exc = fut.exception()
+            if exc is None:
+                done[name] = fut.result()
+            elif isinstance(exc, Exception):
+                failed[name] = exc
+            else:
+                raise exc
+    return done, failed
+
+
+# Snapshot writes go through one worker so they land in submission order; run_jobs does not wait
+# for its own, while cache_latest_result/get_cached_result wait so callers see a consistent store.
+# Executor threads are joined at interpreter exit, so queued writes are not lost.
+_RESULT_WRITER: ThreadPoolExecutor | None = None
+_RESULT_WRITER_LOCK = threading.Lock()
+_LAST_RESULT_WRITE: Future | None = None
+
+
+def _submit_result_write(db_path: Path, rows: List[Tuple[str, str, str]]) -> Future:
+    global _RESULT_WRITER, _LAST_RESULT_WRITE
+    with _RESULT_WRITER_LOCK:
+        if _RESULT_WRITER is None:
+            _RESULT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mailhub-results")
+        fut = _RESULT_WRITER.submit(_write_result_rows, db_path, rows)
+        _LAST_RESULT_WRITE = fut
+        return fut
+
+
+def _write_result_rows(db_path: Path, rows: List[Tuple[str, str, str]]) -> None:
+    db = DB(db_path)
     db.init()
-    key = f"openclaw.results.{(section or '').strip().lower()}"
+    db.kv_set_many(rows)
+
+
+def _cached_result_row(section: str, payload: Any) -> Tuple[Dict[str, Any], Tuple[str, str, str]]:
+    sec = (section or "").strip().lower()
+    now = utc_now_iso()
     wrapped = {
-        "section": (section or "").strip().lower(),
-        "updated_at": utc_now_iso(),
+        "section": sec,
+        "updated_at": now,
         "payload": payload,
     }
-    db.kv_set(key, json.dumps(wrapped, ensure_ascii=False), utc_now_iso())
+    return wrapped, (f"openclaw.results.{sec}", json.dumps(wrapped, ensure_ascii=False), now)
+
+
+def cache_latest_result(
+    section: str, payload: Dict[str, Any], *, settings: Settings | None = None
+) -> Dict[str, Any]:
+    s = settings or Settings.load()
+    wrapped, row = _cached_result_row(section, payload)
+    _submit_result_write(s.db_path, [row]).result()
     return wrapped
 
 
 def get_cached_result(section: str) -> Dict[str, Any]:
+    pending = _LAST_RESULT_WRITE
+    if pending is not None:
+        pending.exception()  # wait for queued snapshot writes; their errors are not ours to raise
     s = Settings.load()
     db = DB(s.db_path)
     db.init()
@@ -796,10 +957,7 @@ def validate_billing_schedule(tz_name: str, days_csv: str, times_csv: str) -> Tu
 
 
 def _provider_kind_counts(providers: List[Dict[str, Any]]) -> Dict[str, int]:
-    out: Dict[str, int] = {}
-    for p in providers:
-        out[p["kind"]] = out.get(p["kind"], 0) + 1
-    return out
+    return dict(Counter(p["kind"] for p in providers))
 
 
 def _db_stats(db: DB) -> Dict[str, int]:
@@ -619,9 +619,16 @@ class DB:
             con.close()
 
     def kv_set(self, key: str, value: str, updated_at: str) -> None:
+        self.kv_set_many([(key, value, updated_at)])
+
+    def kv_set_many(self, items: Iterable[Tuple[str, str, str]]) -> None:
+        """Upsert (key, value, updated_at) rows on one connection in a single transaction."""
+        rows = list(items)
+        if not rows:
+            return
         con = self.connect()
         try:
-            con.execute(
+            con.executemany(
                 """
                 INSERT INTO kv (k, v, updated_at)
                 VALUES (?, ?, ?)
@@ -629,7 +636,7 @@ class DB:
                   v=excluded.v,
                   updated_at=excluded.updated_at
                 """,
-                (key, value, updated_at),
+                rows,
             )
             con.commit()
         finally:
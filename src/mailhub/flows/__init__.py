@@ -1 +1,25 @@
 """Business workflow modules (mail/calendar/summary pipelines)."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY = {
+    "analysis": ".analysis",
+    "billing": ".billing",
+    "calendar": ".calendar",
+    "ingest": ".ingest",
+    "reply": ".reply",
+    "summary": ".summary",
+    "triage": ".triage",
+}
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: load a flow submodule only when it is first referenced.
+    if name in _LAZY:
+        mod = importlib.import_module(_LAZY[name], __name__)
+        globals()[name] = mod
+        return mod
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
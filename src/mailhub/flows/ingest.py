@@ -14,7 +14,7 @@ from ..shared.time import utc_now_iso, today_yyyy_mm_dd_utc
 
 from ..connectors.providers.imap_smtp import fetch_and_store_recent_full
 from ..connectors.providers.google_gmail import gmail_list_messages, gmail_get_message
-from ..connectors.providers.ms_graph import graph_list_recent_messages, graph_get_message
+from ..connectors.providers.ms_graph import BATCH_MAX_REQUESTS, graph_get_messages, graph_list_recent_messages
 
 from .triage import normalize_and_store_message
 
@@ -384,17 +384,24 @@ def _poll_microsoft_provider(s: Settings, db: DB, provider: Dict[str, Any]) -> D
 
         retries = 0
         page = listed.get("items") or []
-        for ref in page:
-            raw = _call_with_backoff(
-                lambda: graph_get_message(ref["provider_id"], ref["graph_id"]),
+        # Hydrate the page with $batch, one POST per BATCH_MAX_REQUESTS ids. Backoff wraps each
+        # chunk, so a rate-limited sub-request only re-fetches its own chunk, and each chunk is
+        # stored before the next is requested.
+        for start in range(0, len(page), BATCH_MAX_REQUESTS):
+            chunk = page[start : start + BATCH_MAX_REQUESTS]
+            raws = _call_with_backoff(
+                lambda: graph_get_messages(pid, [ref["graph_id"] for ref in chunk]),
                 retries=int(f.backoff_retries),
                 initial_seconds=int(f.backoff_initial_seconds),
                 max_seconds=int(f.backoff_max_seconds),
             )
-            normalize_and_store_message(raw, provider_kind="microsoft", raw_source=raw, provider_id=ref["provider_id"])
-            msg_date = str(raw.get("receivedDateTime") or "")
-            latest = _date_max(latest, msg_date)
-            out_items.append({"id": raw.get("id"), "subject": raw.get("subject"), "date_utc": msg_date})
+            for ref, raw in zip(chunk, raws):
+                normalize_and_store_message(
+                    raw, provider_kind="microsoft", raw_source=raw, provider_id=ref["provider_id"]
+                )
+                msg_date = str(raw.get("receivedDateTime") or "")
+                latest = _date_max(latest, msg_date)
+                out_items.append({"id": raw.get("id"), "subject": raw.get("subject"), "date_utc": msg_date})
 
         pages += 1
         next_url = str(listed.get("next_page_url") or "")
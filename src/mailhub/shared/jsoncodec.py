@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson as _orjson
+except Exception:  # optional accelerator; stdlib json is the fallback
+    _orjson = None
+
+
+def loads(raw: str | bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(obj: Any, *, default: Optional[Callable[[Any], Any]] = None, indent: bool = False) -> str:
+    """
+    JSON text (UTF-8, non-ASCII kept as-is); compact unless `indent` asks for 2-space layout.
+    orjson rejects a few inputs stdlib accepts (non-str keys, >64-bit ints); those fall back.
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return _orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=default, indent=2 if indent else None)
+
+
+def dumpb(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Compact UTF-8 JSON bytes, for pipes and sockets that take bytes anyway."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, default=default, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=default).encode("utf-8")